@@ -0,0 +1,97 @@
+import io
+import wave
+from contextlib import contextmanager
+
+import numpy as np
+import speech_recognition as sr
+
+# Capture side: raw samples -> recognizer input, without touching disk
+def samples_to_audio_data(samples, sample_rate):
+    samples = np.ascontiguousarray(samples, dtype=np.int16).reshape(-1)
+    return sr.AudioData(memoryview(samples).tobytes(), sample_rate, 2)
+
+def audio_data_to_wav(audio_data):
+    return audio_data.get_wav_data()
+
+class UnreadableAudioError(ValueError):
+    # The input is not WAV, FLAC or AIFF audio: a problem with the caller's file, not with us
+    pass
+
+@contextmanager
+def open_audio_file(source):
+    # sr.AudioFile, with input it cannot decode reported as UnreadableAudioError
+    audio_file = sr.AudioFile(source)
+    try:
+        audio_file.__enter__()
+    except ValueError as e:
+        raise UnreadableAudioError(str(e)) from e
+    try:
+        yield audio_file
+    finally:
+        audio_file.__exit__(None, None, None)
+
+def load_audio(source, recognizer=None):
+    # Accepts AudioData, raw WAV/FLAC bytes or a file-like object
+    if isinstance(source, sr.AudioData):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    recognizer = recognizer or sr.Recognizer()
+    with open_audio_file(source) as audio_file:
+        return recognizer.record(audio_file)
+
+# Playback side: gTTS straight into a buffer
+def synthesize_mp3(text, language_code, slow=False):
+    from gtts import gTTS
+    buffer = io.BytesIO()
+    gTTS(text=text, lang=language_code, slow=slow).write_to_fp(buffer)
+    return buffer.getvalue()
+
+# MPEG audio Layer III frame headers, enough to time playback without a decoder
+MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+# gTTS serves 32 kbit/s MP3; used when no frame header can be read
+FALLBACK_BYTES_PER_SECOND = 4000
+
+def _mp3_duration(data):
+    i = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        i = 10 + ((data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9])
+    seconds = 0.0
+    while i + 4 <= len(data):
+        header = int.from_bytes(data[i:i + 4], "big")
+        version = (header >> 19) & 3
+        bitrate_index = (header >> 12) & 15
+        rate_index = (header >> 10) & 3
+        if (header >> 21) != 0x7FF or version == 1 or (header >> 17) & 3 != 1 \
+                or bitrate_index in (0, 15) or rate_index == 3:
+            i += 1
+            continue
+        bitrate = MP3_BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+        sample_rate = MP3_SAMPLE_RATES[version][rate_index]
+        samples = 1152 if version == 3 else 576
+        seconds += samples / sample_rate
+        i += samples // 8 * bitrate // sample_rate + ((header >> 9) & 1)
+    return seconds or len(data) / FALLBACK_BYTES_PER_SECOND
+
+def audio_duration(data, mime_type="audio/mp3"):
+    if mime_type == "audio/wav":
+        with wave.open(io.BytesIO(data)) as wav:
+            return wav.getnframes() / wav.getframerate()
+    return _mp3_duration(data)
+
+def join_audio(chunks, mime_type="audio/mp3"):
+    # MP3 frames can simply be concatenated; WAV needs one header for the whole stream
+    if mime_type != "audio/wav":
+        return b"".join(chunks)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        for i, chunk in enumerate(chunks):
+            with wave.open(io.BytesIO(chunk)) as wav:
+                if i == 0:
+                    out.setparams(wav.getparams())
+                out.writeframes(wav.readframes(wav.getnframes()))
+    return buffer.getvalue()
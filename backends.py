@@ -0,0 +1,151 @@
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+import wave
+
+import numpy as np
+
+from transport import get_provider, route_module
+
+# Registered engines, selected by name (see TRANSLATION_BACKEND etc. in .env)
+TRANSLATORS = {}
+RECOGNIZERS = {}
+SYNTHESIZERS = {}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+def register_translator(name):
+    def decorator(cls):
+        cls.name = name
+        TRANSLATORS[name] = cls
+        return cls
+    return decorator
+
+def register_recognizer(name):
+    def decorator(cls):
+        cls.name = name
+        RECOGNIZERS[name] = cls
+        return cls
+    return decorator
+
+def register_synthesizer(name):
+    def decorator(cls):
+        cls.name = name
+        SYNTHESIZERS[name] = cls
+        return cls
+    return decorator
+
+def _get(registry, kind, name):
+    if name not in registry:
+        raise ValueError(f"Unknown {kind} backend '{name}'. Available: {', '.join(sorted(registry))}")
+    with _instances_lock:
+        key = (kind, name)
+        if key not in _instances:
+            _instances[key] = registry[name]()
+        return _instances[key]
+
+def get_translation_backend(name=None):
+    return _get(TRANSLATORS, "translation", name or os.getenv("TRANSLATION_BACKEND", "google"))
+
+def get_recognition_backend(name=None):
+    return _get(RECOGNIZERS, "recognition", name or os.getenv("RECOGNITION_BACKEND", "google"))
+
+def get_speech_backend(name=None):
+    return _get(SYNTHESIZERS, "speech", name or os.getenv("SPEECH_BACKEND", "gtts"))
+
+def _simulated_latency():
+    return float(os.getenv("OFFLINE_LATENCY_MS", 0)) / 1000
+
+# Network engines
+@register_translator("google")
+class GoogleTranslatorBackend:
+    def translate(self, text, target, source='auto'):
+        from deep_translator import GoogleTranslator
+        route_module("deep_translator.google", "google_translate")
+        return GoogleTranslator(source=source, target=target).translate(text)
+
+@register_recognizer("google")
+class GoogleRecognizerBackend:
+    def __init__(self):
+        import speech_recognition as sr
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, audio_data, language='en-IN'):
+        # speech_recognition talks urllib, so only the limiter, retries and breaker apply here
+        import speech_recognition as sr
+        return get_provider("google_speech").call(self.recognizer.recognize_google, audio_data,
+                                                  language=language, retry_on=(sr.RequestError,))
+
+@register_synthesizer("gtts")
+class GTTSBackend:
+    mime_type = "audio/mp3"
+
+    def synthesize(self, text, language_code):
+        import gtts.tts
+        from audio_io import synthesize_mp3
+        route_module("gtts.tts", "gtts")
+        return synthesize_mp3(text, language_code)
+
+# Local stand-ins: deterministic, no network, configurable latency
+@register_translator("offline")
+class OfflineTranslator:
+    # Word-by-word lookup in OFFLINE_DICTIONARY ({"hi": {"hello": "नमस्ते"}}), unknown words echoed
+    def __init__(self, dictionary_path=None, latency=None):
+        self.latency = _simulated_latency() if latency is None else latency
+        self.dictionary = {}
+        path = dictionary_path or os.getenv("OFFLINE_DICTIONARY")
+        if path:
+            with open(path, encoding="utf-8") as f:
+                self.dictionary = json.load(f)
+
+    def translate(self, text, target, source='auto'):
+        if self.latency:
+            time.sleep(self.latency)
+        words = self.dictionary.get(target, {})
+        translated = re.sub(r"\w+", lambda m: words.get(m.group(0).lower(), m.group(0)), text)
+        return translated if words else f"[{target}] {text}"
+
+@register_recognizer("offline")
+class CannedRecognizer:
+    # Returns a fixed transcript; latency scales with clip length like a real service
+    def __init__(self, transcript=None, latency=None, latency_per_second=0.0):
+        self.transcript = transcript or os.getenv("OFFLINE_TRANSCRIPT", "hello world")
+        self.latency = _simulated_latency() if latency is None else latency
+        self.latency_per_second = latency_per_second
+
+    def recognize(self, audio_data, language='en-IN'):
+        duration = len(audio_data.frame_data) / (audio_data.sample_rate * audio_data.sample_width)
+        delay = self.latency + self.latency_per_second * duration
+        if delay:
+            time.sleep(delay)
+        return self.transcript
+
+@register_synthesizer("offline")
+class ToneSynthesizer:
+    # A short WAV tone whose pitch depends on the text, about 60 ms per character
+    mime_type = "audio/wav"
+
+    def __init__(self, latency=None, sample_rate=16000):
+        self.latency = _simulated_latency() if latency is None else latency
+        self.sample_rate = sample_rate
+
+    def synthesize(self, text, language_code):
+        if self.latency:
+            time.sleep(self.latency)
+        digest = hashlib.sha256(f"{language_code}:{text}".encode("utf-8")).digest()
+        frequency = 200 + digest[0] * 2
+        n_samples = int(self.sample_rate * 0.06 * max(1, len(text)))
+        t = np.arange(n_samples) / self.sample_rate
+        samples = (8000 * np.sin(2 * np.pi * frequency * t)).astype("<i2")
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(samples.tobytes())
+        return buffer.getvalue()
@@ -0,0 +1,33 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Fan one source text out to many target languages at once
+async def translate_many(text, targets, translate_fn, concurrency=5, timeout=20):
+    # Yields (target, translation, error, seconds) as each request finishes
+    # Blocking clients get their own threads so the default executor size doesn't cap concurrency
+    semaphore = asyncio.Semaphore(concurrency)
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch")
+    loop = asyncio.get_running_loop()
+
+    async def translate_one(target):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                translation = await asyncio.wait_for(loop.run_in_executor(executor, translate_fn, text, target), timeout)
+                return target, translation, None, time.perf_counter() - start
+            except asyncio.TimeoutError:
+                return target, None, TimeoutError(f"timed out after {timeout}s"), time.perf_counter() - start
+            except Exception as e:
+                return target, None, e, time.perf_counter() - start
+
+    try:
+        for next_result in asyncio.as_completed([translate_one(target) for target in targets]):
+            yield await next_result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def translate_many_sync(text, targets, translate_fn, **kwargs):
+    async def collect():
+        return [result async for result in translate_many(text, targets, translate_fn, **kwargs)]
+    return asyncio.run(collect())
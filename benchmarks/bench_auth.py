@@ -0,0 +1,56 @@
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import ConnectionPool, UserStore, hash_password
+
+# Login throughput with N concurrent sessions: connection per call vs shared pool
+
+def connect_per_call_login(path, username, password):
+    # Mirrors the original verify_user: open, query, close
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    c.execute("SELECT * FROM users WHERE username=? AND password=?",
+              (username, hash_password(password)))
+    result = c.fetchone()
+    conn.close()
+    return result is not None
+
+def run(login, sessions, logins_per_session):
+    def session(i):
+        for j in range(logins_per_session):
+            assert login(f"user{(i + j) % 100}", "secret")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        list(executor.map(session, range(sessions)))
+    elapsed = time.perf_counter() - start
+    return sessions * logins_per_session / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Login throughput: connection per call vs pooled")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--logins", type=int, default=200, help="logins per session")
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "auth.db")
+        store = UserStore(ConnectionPool(path, size=args.pool_size))
+        for i in range(100):
+            store.create_user(f"user{i}", "secret", f"user{i}@example.com")
+
+        print(f"{'sessions':>8} {'per-call/s':>12} {'pooled/s':>12} {'speedup':>8}")
+        for sessions in args.sessions:
+            baseline = run(lambda u, p: connect_per_call_login(path, u, p), sessions, args.logins)
+            pooled = run(store.verify_user, sessions, args.logins)
+            print(f"{sessions:>8} {baseline:>12.0f} {pooled:>12.0f} {pooled / baseline:>7.1f}x")
+        store.pool.close()
+
+if __name__ == "__main__":
+    main()
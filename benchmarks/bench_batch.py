@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import contextlib
+import http.client
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import percentile
+
+# Headless throughput: files/s through cli.py and requests/s through server.py against worker count.
+# Runs on the offline engines with a fresh cache and no translation memory, so every item reaches the backend.
+
+def make_inputs(directory, files, sentences):
+    os.makedirs(directory)
+    for i in range(files):
+        with open(os.path.join(directory, f"doc{i:05d}.txt"), "w", encoding="utf-8") as f:
+            f.write(" ".join(f"Document {i} says sentence number {j} in plain words." for j in range(sentences)))
+
+def bench_cli(cli, inputs, output, workers):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        cli.main(["translate", inputs, "--target", "hi", "--output", output, "--workers", str(workers)])
+    return time.perf_counter() - start
+
+def bench_api(port, texts, clients):
+    # Each client keeps one connection open and sends its share of the requests back to back
+    def client(share):
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        latencies = []
+        for text in share:
+            start = time.perf_counter()
+            connection.request("POST", "/translate", json.dumps({"text": text, "target": "hi"}),
+                               {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            assert response.status == 200, response.status
+            latencies.append((time.perf_counter() - start) * 1000)
+        connection.close()
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        shares = executor.map(client, [texts[i::clients] for i in range(clients)])
+        latencies = [ms for share in shares for ms in share]
+    return time.perf_counter() - start, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch CLI and HTTP API throughput against worker count")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--sentences", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--latency-ms", type=float, default=100, help="offline backend latency per call")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.update(TRANSLATION_BACKEND="offline", OFFLINE_LATENCY_MS=str(args.latency_ms),
+                      CACHE_DB=os.path.join(tmp, "cache.db"), TRANSLATION_MEMORY="0")
+    import cli
+    from server import APIServer
+
+    inputs = os.path.join(tmp, "in")
+    make_inputs(inputs, args.files, args.sentences)
+    print(f"{'workers':>7} {'cli files/s':>12} {'api req/s':>10} {'api p50 ms':>11} {'api p99 ms':>11}")
+    for run, workers in enumerate(args.workers):
+        # New inputs per run, so earlier runs do not warm the cache
+        tag = f"run {run} "
+        texts = [f"{tag}request {i} asks for a translation of this sentence." for i in range(args.files)]
+        for name in os.listdir(inputs):
+            with open(os.path.join(inputs, name), "r+", encoding="utf-8") as f:
+                text = f.read()
+                f.seek(0)
+                f.write(tag + text)
+
+        cli_seconds = bench_cli(cli, inputs, os.path.join(tmp, f"out{run}"), workers)
+
+        api = APIServer(workers=workers)
+        ready = threading.Event()
+        servers = []
+        loop = asyncio.new_event_loop()
+        def serve():
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(api.serve("127.0.0.1", 0, lambda server: (servers.append(server), ready.set())))
+        threading.Thread(target=serve, daemon=True).start()
+        ready.wait()
+        port = servers[0].sockets[0].getsockname()[1]
+        api_seconds, latencies = bench_api(port, texts, clients=workers)
+
+        print(f"{workers:>7} {args.files / cli_seconds:>12.1f} {args.files / api_seconds:>10.1f} "
+              f"{percentile(latencies, 50):>11.1f} {percentile(latencies, 99):>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import OfflineTranslator
+from cache import make_key
+from common import percentile
+from singleflight import SingleFlight
+
+# Backend calls and latency during a spike of identical requests, with and without single-flight
+
+def run(sessions, phrases, flight, latency_ms, seed=0):
+    backend = OfflineTranslator(latency=latency_ms / 1000)
+    calls = 0
+    lock = threading.Lock()
+
+    def translate(text):
+        nonlocal calls
+        with lock:
+            calls += 1
+        return backend.translate(text, "hi")
+
+    rng = random.Random(seed)
+    requests = [rng.choice(phrases) for _ in range(sessions)]
+    barrier = threading.Barrier(sessions)
+
+    def session(text):
+        barrier.wait()
+        start = time.perf_counter()
+        if flight is None:
+            translate(text)
+        else:
+            flight.do(make_key(text, "hi"), translate, text)
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        latencies = list(executor.map(session, requests))
+    return calls, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="Request coalescing under a spike of identical requests")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[8, 32, 128])
+    parser.add_argument("--phrases", type=int, default=3, help="distinct popular phrases in the spike")
+    parser.add_argument("--latency-ms", type=float, default=200)
+    args = parser.parse_args()
+
+    phrases = [f"popular phrase number {i}" for i in range(args.phrases)]
+    print(f"{'sessions':>8} {'mode':>13} {'backend calls':>14} {'ratio':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for sessions in args.sessions:
+        for mode in ("direct", "single-flight"):
+            flight = SingleFlight() if mode == "single-flight" else None
+            calls, latencies = run(sessions, phrases, flight, args.latency_ms)
+            ratio = flight.stats()["coalescing_ratio"] if flight else 0.0
+            print(f"{sessions:>8} {mode:>13} {calls:>14} {ratio:>6.2f} "
+                  f"{percentile(latencies, 50):>8.1f} {percentile(latencies, 95):>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from longform import transcribe_long
+
+# Long-recording transcription time against worker count, with a simulated recognizer
+
+def make_recording(path, minutes, sample_rate=16000, seed=0):
+    # Tone "phrases" of 1-4 s separated by 0.3-1 s pauses, written block by block
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * sample_rate)
+    written = 0
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        while written < total:
+            n = int(rng.uniform(1, 4) * sample_rate)
+            t = np.arange(n) / sample_rate
+            phrase = (3000 * np.sin(2 * np.pi * rng.uniform(150, 300) * t)).astype(np.int16)
+            pause = np.zeros(int(rng.uniform(0.3, 1.0) * sample_rate), dtype=np.int16)
+            f.writeframes(np.concatenate((phrase, pause)).tobytes())
+            written += n + len(pause)
+    return written / sample_rate
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel long-recording transcription scaling")
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--window", type=float, default=30, help="window length in seconds")
+    parser.add_argument("--latency-ms", type=float, default=300, help="simulated recognition time per window")
+    args = parser.parse_args()
+
+    def recognize(samples, sample_rate):
+        time.sleep(args.latency_ms / 1000)
+        return f"window of {len(samples) / sample_rate:.1f} seconds"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "recording.wav")
+        duration = make_recording(path, args.minutes)
+        print(f"{duration / 60:.1f} min of audio, {args.window:.0f} s windows, {args.latency_ms:.0f} ms per window")
+        print(f"{'workers':>7} {'seconds':>8} {'x realtime':>11} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            transcribe_long(path, recognize, max_workers=workers, window_s=args.window)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>7} {elapsed:>8.2f} {duration / elapsed:>11.0f} {baseline / elapsed:>8.2f}")
+
+if __name__ == "__main__":
+    main()
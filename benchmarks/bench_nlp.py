@@ -0,0 +1,49 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nlp
+
+# Summarization and keyword extraction time against input size
+
+def make_text(n_words, vocabulary_size=20000, sentence_length=18, seed=0):
+    # Zipf-like word frequencies, roughly like natural text
+    rng = random.Random(seed)
+    words = [f"term{i}" for i in range(vocabulary_size)]
+    weights = [1 / (i + 1) for i in range(vocabulary_size)]
+    tokens = rng.choices(words, weights=weights, k=n_words)
+    sentences = [" ".join(tokens[i:i + sentence_length]) + "." for i in range(0, n_words, sentence_length)]
+    return " ".join(sentences)
+
+def measure(fn, text, repeats):
+    times = []
+    for _ in range(repeats):
+        nlp._analyze.cache_clear()
+        start = time.perf_counter()
+        fn(text)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarizer and keyword extraction scaling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000, 100000, 200000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'words':>8} {'summary ms':>11} {'keywords ms':>12} {'cached ms':>10} {'us/word':>8}")
+    for size in args.sizes:
+        text = make_text(size)
+        summary_ms = measure(nlp.summarize, text, args.repeats)
+        keywords_ms = measure(nlp.extract_keywords, text, args.repeats)
+        start = time.perf_counter()
+        nlp.extract_keywords(text)
+        cached_ms = (time.perf_counter() - start) * 1000
+        print(f"{size:>8} {summary_ms:>11.1f} {keywords_ms:>12.1f} {cached_ms:>10.2f} {summary_ms * 1000 / size:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from audio_io import samples_to_audio_data
+from common import percentile
+
+# Headless voice -> text -> translation -> speech benchmark through engine.py, so preprocessing,
+# the translation memory, single-flight and both caches are measured as the app runs them.
+# The engine reads its settings at import, so it is imported once the environment is set.
+
+STAGES = ["capture", "recognize", "translate", "synthesize"]
+
+def make_fixtures(directory, count=5, sample_rate=44100):
+    # Synthetic stand-ins for recordings: tone bursts separated by low noise
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(count):
+        parts = []
+        for _ in range(3 + i):
+            burst = np.sin(2 * np.pi * (180 + 40 * i) * np.arange(int(0.6 * sample_rate)) / sample_rate)
+            parts.append((6000 * burst).astype(np.int16))
+            parts.append(rng.normal(0, 60, int(0.3 * sample_rate)).astype(np.int16))
+        path = os.path.join(directory, f"fixture_{i}.wav")
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(np.concatenate(parts).tobytes())
+        paths.append(path)
+    return paths
+
+def read_samples(path):
+    with wave.open(path, "rb") as wav:
+        return np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16), wav.getframerate()
+
+class Pipeline:
+    def __init__(self, engine, target):
+        self.engine = engine
+        self.target = target
+
+    def run(self, path):
+        timings = {}
+        start = time.perf_counter()
+        samples, sample_rate = read_samples(path)
+        audio_data = samples_to_audio_data(samples, sample_rate)
+        timings["capture"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        text = self.engine.recognize(audio_data, "English")
+        timings["recognize"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        translated = self.engine.translate_with_memory(text, self.target)
+        timings["translate"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        audio = self.engine.synthesize(translated, self.target)
+        timings["synthesize"] = time.perf_counter() - start
+        return timings, len(audio_data.frame_data), len(audio)
+
+def summarize(samples_ms):
+    return {
+        "count": len(samples_ms),
+        "mean_ms": sum(samples_ms) / len(samples_ms),
+        "p50_ms": percentile(samples_ms, 50),
+        "p95_ms": percentile(samples_ms, 95),
+        "p99_ms": percentile(samples_ms, 99),
+        "max_ms": max(samples_ms),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end latency of the voice translation pipeline")
+    parser.add_argument("--fixtures", help="glob of WAV files (default: generated tone fixtures)")
+    parser.add_argument("--iterations", type=int, default=50, help="pipeline runs in total")
+    parser.add_argument("--workers", type=int, default=1, help="concurrent pipeline runs")
+    parser.add_argument("--target", default="hi")
+    parser.add_argument("--translation-backend", default="offline")
+    parser.add_argument("--recognition-backend", default="offline")
+    parser.add_argument("--speech-backend", default="offline")
+    parser.add_argument("--no-memory", action="store_true", help="turn the translation memory off")
+    parser.add_argument("--no-preprocessing", action="store_true", help="upload captured audio as it is")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = sorted(glob.glob(args.fixtures)) if args.fixtures else make_fixtures(workdir)
+        if not paths:
+            parser.error(f"no fixtures match {args.fixtures}")
+        # Fresh caches and memory per run: the first pass over each input reaches the backends
+        os.environ.update(
+            TRANSLATION_BACKEND=args.translation_backend,
+            RECOGNITION_BACKEND=args.recognition_backend,
+            SPEECH_BACKEND=args.speech_backend,
+            CACHE_DB=os.path.join(workdir, "cache.db"),
+            TM_DB=os.path.join(workdir, "translation_memory.db"),
+            TRANSLATION_MEMORY="0" if args.no_memory else "1",
+            AUDIO_PREPROCESSING="0" if args.no_preprocessing else "1",
+        )
+        import engine
+        from metrics import metrics
+        pipeline = Pipeline(engine, args.target)
+        jobs = [paths[i % len(paths)] for i in range(args.iterations)]
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(pipeline.run, jobs))
+        wall = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    stage_ms = {stage: [r[0][stage] * 1000 for r in results] for stage in STAGES}
+    totals = [sum(r[0].values()) * 1000 for r in results]
+    report = {
+        "config": {
+            "iterations": args.iterations,
+            "workers": args.workers,
+            "fixtures": len(paths),
+            "target": args.target,
+            "backends": [args.recognition_backend, args.translation_backend, args.speech_backend],
+            "translation_memory": not args.no_memory,
+            "preprocessing": not args.no_preprocessing,
+            "offline_latency_ms": float(os.getenv("OFFLINE_LATENCY_MS", 0)),
+            "python": platform.python_version(),
+        },
+        "stages": {stage: summarize(values) for stage, values in stage_ms.items()},
+        "total": summarize(totals),
+        "throughput_per_s": len(results) / wall,
+        "wall_s": wall,
+        "peak_memory_bytes": peak,
+        "input_audio_bytes": sum(r[1] for r in results),
+        "output_audio_bytes": sum(r[2] for r in results),
+        # Per-operation engine metrics: backend calls, cache hits and coalesced requests
+        "engine": metrics.snapshot(),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_io import samples_to_audio_data
+from preprocess import flac_bytes, preprocess_audio_data
+
+# Upload size and time per clip, raw 44.1 kHz capture vs the preprocessing stage
+
+def make_clip(seconds, sample_rate, seed):
+    # Room noise with a DC offset around a few seconds of tone "speech", like a push-to-talk capture
+    rng = np.random.default_rng(seed)
+    lead, tail = rng.uniform(0.5, 2.0, 2)
+    speech = np.arange(int(seconds * sample_rate)) / sample_rate
+    voiced = 4000 * np.sin(2 * np.pi * rng.uniform(120, 260) * speech) * (np.sin(2 * np.pi * 3 * speech) > 0)
+    parts = [rng.normal(0, 50, int(lead * sample_rate)), voiced, rng.normal(0, 50, int(tail * sample_rate))]
+    return (np.concatenate(parts) + 300).astype(np.int16)
+
+def upload_ms(n_bytes, kbps):
+    return n_bytes * 8 / kbps
+
+def read_clip(path):
+    with wave.open(path, "rb") as wav:
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        return samples[::wav.getnchannels()], wav.getframerate()
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes and milliseconds saved per clip by audio preprocessing")
+    parser.add_argument("--fixtures", help="glob of 16-bit WAV files (default: generated clips)")
+    parser.add_argument("--clips", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument("--uplink-kbps", type=float, default=1000, help="for the estimated upload time")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        clips = [read_clip(path) for path in sorted(glob.glob(args.fixtures))]
+    else:
+        clips = [(make_clip(args.seconds, args.sample_rate, i), args.sample_rate) for i in range(args.clips)]
+    # The first call pays for importing scipy.signal
+    preprocess_audio_data(samples_to_audio_data(clips[0][0], clips[0][1]))
+
+    rows = []
+    for samples, sample_rate in clips:
+        raw = samples_to_audio_data(samples, sample_rate)
+        start = time.perf_counter()
+        raw_flac = flac_bytes(raw)
+        raw_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        processed = preprocess_audio_data(raw)
+        preprocess_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        processed_flac = flac_bytes(processed)
+        processed_ms = (time.perf_counter() - start) * 1000
+
+        rows.append({
+            "raw_bytes": len(raw_flac),
+            "processed_bytes": len(processed_flac),
+            "seconds_in": len(raw.frame_data) / 2 / sample_rate,
+            "seconds_out": len(processed.frame_data) / 2 / processed.sample_rate,
+            "preprocess_ms": preprocess_ms,
+            "raw_total_ms": raw_ms + upload_ms(len(raw_flac), args.uplink_kbps),
+            "processed_total_ms": preprocess_ms + processed_ms + upload_ms(len(processed_flac), args.uplink_kbps),
+        })
+
+    print(f"{'clip':>4} {'audio s':>8} {'kept s':>7} {'raw FLAC':>9} {'processed':>10} {'ratio':>6} "
+          f"{'prep ms':>8} {'raw ms':>7} {'new ms':>7} {'saved ms':>9}")
+    for i, row in enumerate(rows):
+        print(f"{i:>4} {row['seconds_in']:>8.2f} {row['seconds_out']:>7.2f} {row['raw_bytes']:>9} "
+              f"{row['processed_bytes']:>10} {row['raw_bytes'] / max(1, row['processed_bytes']):>6.1f} "
+              f"{row['preprocess_ms']:>8.1f} {row['raw_total_ms']:>7.0f} {row['processed_total_ms']:>7.0f} "
+              f"{row['raw_total_ms'] - row['processed_total_ms']:>9.0f}")
+    saved_bytes = statistics.mean(r["raw_bytes"] - r["processed_bytes"] for r in rows)
+    saved_ms = statistics.mean(r["raw_total_ms"] - r["processed_total_ms"] for r in rows)
+    print(f"mean per clip: {saved_bytes:.0f} bytes and {saved_ms:.0f} ms saved "
+          f"(FLAC encode + upload at {args.uplink_kbps:.0f} kbit/s)")
+
+if __name__ == "__main__":
+    main()
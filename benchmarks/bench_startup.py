@@ -0,0 +1,103 @@
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Cold start and warm rerun latency of speech.py, driven headlessly with Streamlit's AppTest.
+# --baseline REV times the app as it was at a git revision the same way, for a before/after table.
+# Each app is timed in a fresh interpreter, so the cold run really is cold.
+
+HEAVY_MODULES = ["streamlit", "speech_recognition", "deep_translator", "gtts",
+                 "docx", "PyDictionary", "sounddevice", "numpy", "scipy"]
+
+def import_cost(module):
+    # Fresh interpreter so earlier imports don't hide the cost
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip()) * 1000
+
+def time_app(app_dir, reruns):
+    from streamlit.testing.v1 import AppTest
+    os.chdir(app_dir)
+    sys.path.insert(0, app_dir)
+    app = AppTest.from_file(os.path.join(app_dir, "speech.py"), default_timeout=60)
+    start = time.perf_counter()
+    app.run()
+    cold = (time.perf_counter() - start) * 1000
+    if app.exception:
+        # e.g. an old revision importing sounddevice at the top on a machine without PortAudio
+        return {"error": app.exception[0].message}
+    warm = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        warm.append((time.perf_counter() - start) * 1000)
+    deferred = [m for m in ("docx", "gtts", "sounddevice", "PyDictionary")
+                if m not in sys.modules and importlib.util.find_spec(m) is not None]
+    return {"cold_ms": cold, "warm_p50_ms": statistics.median(warm), "warm_max_ms": max(warm),
+            "reruns": len(warm), "deferred": deferred}
+
+def measure(app_dir, reruns):
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", app_dir, "--reruns", str(reruns)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"timing {app_dir} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def export_revision(revision, directory):
+    # The whole tree at that revision, so speech.py runs against the modules it was written for
+    archive = subprocess.run(["git", "archive", "--format=tar", revision], capture_output=True, cwd=ROOT, check=True)
+    path = os.path.join(directory, "app.tar")
+    with open(path, "wb") as f:
+        f.write(archive.stdout)
+    with tarfile.open(path) as tar:
+        tar.extractall(directory)
+    os.remove(path)
+    return directory
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup and rerun latency of the Streamlit app")
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--baseline", metavar="REV", help="also time speech.py at this git revision")
+    parser.add_argument("--measure", metavar="DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(time_app(args.measure, args.reruns)))
+        return
+
+    print("Import cost (ms, fresh interpreter)")
+    for module in HEAVY_MODULES:
+        cost = import_cost(module)
+        print(f"  {module:<20} {'n/a' if cost is None else f'{cost:8.1f}'}")
+
+    runs = [("current", measure(ROOT, args.reruns))]
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as directory:
+            runs.insert(0, (args.baseline, measure(export_revision(args.baseline, directory), args.reruns)))
+
+    print(f"\n{'':<12} {'cold ms':>9} {'warm p50 ms':>12} {'warm max ms':>12}  deferred until first use")
+    for name, run in runs:
+        if "error" in run:
+            print(f"{name:<12} failed: {run['error']}")
+            continue
+        print(f"{name:<12} {run['cold_ms']:>9.1f} {run['warm_p50_ms']:>12.1f} {run['warm_max_ms']:>12.1f}  "
+              f"{', '.join(run['deferred']) or 'none'}")
+    if len(runs) == 2 and not any("error" in run for _, run in runs):
+        before, after = runs[0][1], runs[1][1]
+        print(f"{'speedup':<12} {before['cold_ms'] / after['cold_ms']:>8.2f}x "
+              f"{before['warm_p50_ms'] / after['warm_p50_ms']:>11.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import percentile
+from transport import CircuitOpenError, Provider
+
+# Tail latency against a local stub server that adds latency and throttles bursts:
+# a fresh connection per call with no retries vs the shared provider transport
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.02
+    error_rate = 0.05
+    max_in_flight = 8
+    in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            throttled = cls.in_flight > cls.max_in_flight
+        try:
+            time.sleep(cls.latency)
+            if throttled:
+                self._reply(429, b"slow down", {"Retry-After": "0"})
+            elif random.random() < cls.error_rate:
+                self._reply(500, b"error")
+            else:
+                self._reply(200, b"ok")
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def _reply(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def run(get, url, clients, requests_per_client):
+    latencies, failures = [], 0
+    lock = threading.Lock()
+
+    def client(_):
+        nonlocal failures
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            try:
+                ok = get(url).status_code == 200
+            except (requests.RequestException, CircuitOpenError):
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                failures += not ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(client, range(clients)))
+    total = time.perf_counter() - start
+    return latencies, failures, len(latencies) / total
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP tail latency: per-call connections vs shared transport")
+    parser.add_argument("--clients", type=int, nargs="+", default=[4, 16, 32])
+    parser.add_argument("--requests", type=int, default=50, help="requests per client")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--server-capacity", type=int, default=8, help="concurrent requests before 429s")
+    parser.add_argument("--rate", type=float, default=200, help="provider token refill per second")
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency_ms / 1000
+    StubHandler.error_rate = args.error_rate
+    StubHandler.max_in_flight = args.server_capacity
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    print(f"{'clients':>7} {'mode':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'failed %':>9} {'req/s':>8}")
+    for clients in args.clients:
+        provider = Provider("bench", rate=args.rate, burst=args.server_capacity, retries=3,
+                            backoff=0.01, max_backoff=0.2, failure_threshold=50, reset_timeout=1.0,
+                            pool_size=clients)
+        for mode, get in (("per-call", requests.get), ("pooled", provider.session.get)):
+            latencies, failures, throughput = run(get, url, clients, args.requests)
+            print(f"{clients:>7} {mode:>10} {percentile(latencies, 50):>8.1f} {percentile(latencies, 95):>8.1f} "
+                  f"{percentile(latencies, 99):>8.1f} {max(latencies):>8.1f} "
+                  f"{100 * failures / len(latencies):>9.1f} {throughput:>8.0f}")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import ToneSynthesizer
+from cache import TieredCache
+from tts import SpeechSynthesizer, split_for_speech
+
+# Time to first audio against text length: whole-text synthesis vs sentence-chunk streaming
+
+SENTENCE = "This is a sentence of ordinary length for a translated paragraph."
+
+def make_synthesize(ms_per_request, ms_per_100_chars):
+    # gTTS sends one request per ~100 characters, one after another
+    tone = ToneSynthesizer(latency=0)
+    def synthesize(text, language_code):
+        time.sleep((ms_per_request + ms_per_100_chars * len(text) / 100) / 1000)
+        return tone.synthesize(text[:20], language_code)
+    return synthesize
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first audio: whole text vs streamed sentence chunks")
+    parser.add_argument("--sentences", type=int, nargs="+", default=[1, 5, 20, 80])
+    parser.add_argument("--ms-per-request", type=float, default=150)
+    parser.add_argument("--ms-per-100-chars", type=float, default=120)
+    args = parser.parse_args()
+
+    synthesize = make_synthesize(args.ms_per_request, args.ms_per_100_chars)
+    print(f"{'sentences':>9} {'chars':>6} {'chunks':>6} {'whole ms':>9} {'first chunk ms':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, n in enumerate(args.sentences):
+            # A fresh table per size so nothing is served from cache
+            text = " ".join(f"{SENTENCE[:-1]} {j}." for j in range(n))
+            whole = SpeechSynthesizer(TieredCache(os.path.join(tmp, "c.db"), f"whole{i}"), synthesize)
+            streamed = SpeechSynthesizer(TieredCache(os.path.join(tmp, "c.db"), f"stream{i}"), synthesize)
+
+            start = time.perf_counter()
+            whole.synthesize(text, "en")
+            whole_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            next(streamed.stream(text, "en"))
+            first_ms = (time.perf_counter() - start) * 1000
+            print(f"{n:>9} {len(text):>6} {len(split_for_speech(text)):>6} {whole_ms:>9.0f} {first_ms:>15.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+import math
+
+# Helpers shared by the benchmark scripts; each script runs from this directory, so a plain
+# "from common import ..." finds it
+
+def percentile(values, pct):
+    # Nearest-rank percentile; None for no values
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))]
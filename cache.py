@@ -0,0 +1,202 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# Cache keys
+def normalize_text(text):
+    # Same text with different spacing should hit the same entry, but keep line breaks
+    text = unicodedata.normalize("NFC", text).strip()
+    return "\n".join(" ".join(line.split()) for line in text.splitlines())
+
+def make_key(*parts):
+    return hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+def _size_of(value):
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(value)
+
+# In-memory LRU bounded by total bytes
+class LRUCache:
+    def __init__(self, max_bytes=32 * 1024 * 1024, ttl=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                self.current_bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        size = _size_of(value)
+        if size > self.max_bytes:
+            return
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, size, expires_at)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+# SQLite-backed persistent store, optionally capped in bytes (least recently used go first)
+class SQLiteStore:
+    def __init__(self, path, table, ttl=None, max_bytes=None):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(f'''CREATE TABLE IF NOT EXISTS {table}
+                               (key TEXT PRIMARY KEY,
+                                value BLOB,
+                                is_text INTEGER,
+                                expires_at REAL,
+                                accessed_at REAL)''')
+        columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+        if "accessed_at" not in columns:
+            self._conn.execute(f"ALTER TABLE {table} ADD COLUMN accessed_at REAL")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(f"SELECT value, is_text, expires_at FROM {self.table} WHERE key=?",
+                                     (key,)).fetchone()
+            if row is None:
+                return None
+            value, is_text, expires_at = row
+            if expires_at is not None and expires_at < time.time():
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key=?", (key,))
+                self._conn.commit()
+                return None
+            if self.max_bytes:
+                self._conn.execute(f"UPDATE {self.table} SET accessed_at=? WHERE key=?", (time.time(), key))
+                self._conn.commit()
+        return value.decode("utf-8") if is_text else bytes(value)
+
+    def set(self, key, value, ttl=None):
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.time() + ttl if ttl else None
+        is_text = isinstance(value, str)
+        blob = value.encode("utf-8") if is_text else bytes(value)
+        with self._lock:
+            self._conn.execute(f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?, ?)",
+                               (key, blob, int(is_text), expires_at, time.time()))
+            if self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute(f"SELECT COALESCE(SUM(LENGTH(value)), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(f"SELECT key, LENGTH(value) FROM {self.table} ORDER BY accessed_at")
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany(f"DELETE FROM {self.table} WHERE key=?", doomed)
+
+    def purge_expired(self):
+        with self._lock:
+            cur = self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?",
+                                     (time.time(),))
+            self._conn.commit()
+            return cur.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# Memory in front of disk, with hit/miss counters
+class TieredCache:
+    def __init__(self, path, table, max_bytes=32 * 1024 * 1024, ttl=None, disk_max_bytes=None):
+        self.memory = LRUCache(max_bytes=max_bytes, ttl=ttl)
+        self.disk = SQLiteStore(path, table, ttl=ttl, max_bytes=disk_max_bytes)
+        self.ttl = ttl
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.disk.purge_expired()
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is not None:
+            with self._lock:
+                self.memory_hits += 1
+            return value
+        value = self.disk.get(key)
+        if value is not None:
+            self.memory.set(key, value)
+            with self._lock:
+                self.disk_hits += 1
+            return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def peek(self, key):
+        # Same lookup as get() without touching the hit/miss counters, for re-checks of a
+        # key whose lookup was already counted
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key, value, ttl=None):
+        self.memory.set(key, value, ttl)
+        self.disk.set(key, value, ttl)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def stats(self):
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.current_bytes,
+        }
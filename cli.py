@@ -0,0 +1,122 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import engine
+from extract import SUPPORTED_EXTENSIONS
+
+# Batch translation, transcription and speech synthesis over files and directories, no browser needed:
+#   python cli.py translate docs/ --target hi --output out/ --workers 8
+#   python cli.py transcribe recordings/ --language Hindi --output transcripts/
+#   python cli.py synthesize out/ --language hi --output audio/
+
+def find_inputs(paths, extensions, recursive=False):
+    # (path, path relative to its input directory), so a recursive run mirrors the tree in the output
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path, os.path.basename(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            for name in sorted(files):
+                if name.rsplit(".", 1)[-1].lower() in extensions:
+                    full = os.path.join(root, name)
+                    yield full, os.path.relpath(full, path)
+            if not recursive:
+                break
+            dirs.sort()
+
+def output_path(relative, output_dir, suffix):
+    return os.path.join(output_dir, os.path.splitext(relative)[0] + suffix)
+
+def write_atomic(path, data):
+    # Readers and --skip-existing never see a half-written file
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".part"
+    if isinstance(data, str):
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+    else:
+        with open(tmp, "wb") as f:
+            f.write(data)
+    os.replace(tmp, path)
+
+def translate_file(path, args):
+    with open(path, "rb") as f:
+        return engine.translate_source(f, args.target)
+
+def transcribe_file(path, args):
+    return engine.transcribe(path, args.language)
+
+def synthesize_file(path, args):
+    with open(path, encoding="utf-8") as f:
+        return engine.synthesize(f.read(), args.language)
+
+def speech_extension():
+    return ".wav" if engine.speech_mime_type() == "audio/wav" else ".mp3"
+
+# command -> (input extensions, per-file function, output suffix)
+COMMANDS = {
+    "translate": (SUPPORTED_EXTENSIONS, translate_file, lambda args: f".{args.target}.txt"),
+    "transcribe": (engine.AUDIO_EXTENSIONS, transcribe_file, lambda args: ".txt"),
+    "synthesize": (("txt",), synthesize_file, lambda args: f".{args.language}{speech_extension()}"),
+}
+
+def run(args):
+    extensions, process, suffix = COMMANDS[args.command]
+    suffix = suffix(args)
+    jobs = []
+    skipped = 0
+    for path, relative in find_inputs(args.inputs, extensions, args.recursive):
+        target = output_path(relative, args.output, suffix)
+        if args.skip_existing and os.path.exists(target):
+            skipped += 1
+        else:
+            jobs.append((path, target))
+
+    def process_one(path, target):
+        start = time.perf_counter()
+        result = process(path, args)
+        if result is None:
+            raise ValueError("nothing recognized")
+        write_atomic(target, result)
+        return time.perf_counter() - start
+
+    failed = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(process_one, path, target): path for path, target in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            path = futures[future]
+            try:
+                seconds = future.result()
+                print(f"[{done}/{len(jobs)}] {path} ({seconds:.1f}s)", file=sys.stderr)
+            except Exception as e:
+                failed += 1
+                print(f"[{done}/{len(jobs)}] {path} FAILED: {e}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+    print(f"{len(jobs) - failed} done, {failed} failed, {skipped} skipped in {elapsed:.1f}s "
+          f"({len(jobs) / max(elapsed, 1e-9):.1f} files/s)")
+    return 1 if failed else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Translate, transcribe or synthesize files in bulk")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    translate = subparsers.add_parser("translate", help=f"translate {', '.join(SUPPORTED_EXTENSIONS)} files")
+    translate.add_argument("--target", required=True, choices=sorted(engine.LANGUAGE_OPTIONS))
+    transcribe = subparsers.add_parser("transcribe", help=f"transcribe {', '.join(engine.AUDIO_EXTENSIONS)} files")
+    transcribe.add_argument("--language", default="English", help="spoken language, name or code")
+    synthesize = subparsers.add_parser("synthesize", help="speak txt files")
+    synthesize.add_argument("--language", required=True, choices=sorted(engine.LANGUAGE_OPTIONS))
+    for command in (translate, transcribe, synthesize):
+        command.add_argument("inputs", nargs="+", help="files or directories")
+        command.add_argument("--output", "-o", required=True, help="directory for the results")
+        command.add_argument("--workers", type=int, default=4, help="files processed at once")
+        command.add_argument("--recursive", "-r", action="store_true")
+        command.add_argument("--skip-existing", action="store_true", help="resume an interrupted run")
+    args = parser.parse_args(argv)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
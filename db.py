@@ -0,0 +1,88 @@
+import hashlib
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+# Small pool of SQLite connections shared across Streamlit script threads
+class ConnectionPool:
+    def __init__(self, path, size=4, busy_timeout_ms=5000):
+        self.path = path
+        self.size = size
+        self.busy_timeout_ms = busy_timeout_ms
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Connections reuse compiled statements through sqlite3's statement cache
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000,
+                               check_same_thread=False, cached_statements=64)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        return conn
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return self._connect()
+        return self._idle.get(timeout=self.busy_timeout_ms / 1000)
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
+
+# User table access
+CREATE_USERS = '''CREATE TABLE IF NOT EXISTS users
+                  (username TEXT PRIMARY KEY,
+                   password TEXT,
+                   email TEXT,
+                   created_at TIMESTAMP)'''
+INSERT_USER = "INSERT INTO users VALUES (?, ?, ?, ?)"
+SELECT_LOGIN = "SELECT 1 FROM users WHERE username=? AND password=?"
+SELECT_USER = "SELECT 1 FROM users WHERE username=?"
+
+def hash_password(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+class UserStore:
+    def __init__(self, pool):
+        self.pool = pool
+        with self.pool.connection() as conn:
+            conn.execute(CREATE_USERS)
+
+    def create_user(self, username, password, email):
+        with self.pool.connection() as conn:
+            conn.execute(INSERT_USER, (username, hash_password(password), email, datetime.now()))
+
+    def verify_user(self, username, password):
+        with self.pool.connection() as conn:
+            return conn.execute(SELECT_LOGIN, (username, hash_password(password))).fetchone() is not None
+
+    def user_exists(self, username):
+        with self.pool.connection() as conn:
+            return conn.execute(SELECT_USER, (username,)).fetchone() is not None
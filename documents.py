@@ -0,0 +1,115 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# GoogleTranslator rejects payloads over 5000 characters
+MAX_CHUNK_CHARS = 4500
+
+SENTENCE_END = re.compile(r'(?<=[.!?।॥])\s+')
+
+class ChunkTranslationError(Exception):
+    def __init__(self, index, error):
+        super().__init__(f"Chunk {index} failed: {error}")
+        self.index = index
+        self.error = error
+
+# Splitting
+def split_sentences(text):
+    return [s for s in SENTENCE_END.split(text) if s]
+
+def _split_long(text, max_chars):
+    # Sentence boundaries first, then whitespace, then a hard cut
+    pieces = []
+    for sentence in split_sentences(text):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+def _iter_units(paragraphs, max_chars):
+    # (piece, separator) pairs; the very last piece gets no trailing separator
+    previous = None
+    for paragraph in paragraphs:
+        if len(paragraph) <= max_chars:
+            pieces = [(paragraph, "\n")]
+        else:
+            parts = _split_long(paragraph, max_chars)
+            pieces = [(part, " ") for part in parts[:-1]] + [(parts[-1], "\n")]
+        for piece in pieces:
+            if previous is not None:
+                yield previous
+            previous = piece
+    if previous is not None:
+        yield previous[0], ""
+
+def iter_chunks(paragraphs, max_chars=MAX_CHUNK_CHARS):
+    # Lazily groups paragraphs into (chunk, separator) pairs of at most max_chars
+    current, current_len = [], 0
+    for unit, sep in _iter_units(paragraphs, max_chars):
+        if current and current_len + len(unit) > max_chars:
+            yield _close_chunk(current)
+            current, current_len = [], 0
+        current.append((unit, sep))
+        current_len += len(unit) + len(sep)
+    if current:
+        yield _close_chunk(current)
+
+def split_into_chunks(text, max_chars=MAX_CHUNK_CHARS):
+    # Returns (chunk, separator) pairs; joining chunk + separator restores the layout
+    return list(iter_chunks(text.split("\n"), max_chars))
+
+def _close_chunk(units):
+    body = "".join(unit + sep for unit, sep in units[:-1]) + units[-1][0]
+    return body, units[-1][1]
+
+# Translation
+def _translate_with_retry(index, chunk, translate_fn, retries, backoff, check=None):
+    if not chunk.strip():
+        return chunk
+    # check() may raise to stop (e.g. a cancelled job); it runs outside the retry loop
+    if check:
+        check()
+    for attempt in range(retries + 1):
+        try:
+            translated = translate_fn(chunk)
+        except Exception as e:
+            error = e
+        else:
+            # A None or blank result for a chunk with text is a failure, not an empty paragraph
+            if translated and translated.strip():
+                return translated
+            error = "empty translation"
+        if attempt == retries:
+            raise ChunkTranslationError(index, error)
+        time.sleep(backoff * (2 ** attempt))
+
+def translate_chunks(chunks, translate_fn, max_workers=4, retries=0, backoff=0.5, progress=None, check=None):
+    # Provider calls already retry in transport.py, so chunks are not retried again by default
+    # chunks may be a generator: each chunk is submitted as soon as it is produced
+    separators = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for i, (chunk, sep) in enumerate(chunks):
+            futures[executor.submit(_translate_with_retry, i, chunk, translate_fn, retries, backoff, check)] = i
+            separators.append(sep)
+        results = [None] * len(separators)
+        done = 0
+        try:
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                done += 1
+                if progress:
+                    progress(done, len(separators))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return "".join(translated + sep for translated, sep in zip(results, separators))
+
+def translate_document(text, translate_fn, max_chars=MAX_CHUNK_CHARS, **kwargs):
+    return translate_chunks(split_into_chunks(text, max_chars), translate_fn, **kwargs)
@@ -0,0 +1,222 @@
+import os
+import threading
+
+import speech_recognition as sr
+from dotenv import load_dotenv
+
+from audio_io import load_audio, samples_to_audio_data
+from backends import get_recognition_backend, get_speech_backend, get_translation_backend
+from cache import TieredCache, make_key, normalize_text
+from documents import MAX_CHUNK_CHARS, iter_chunks, translate_chunks, translate_document
+from extract import iter_paragraphs
+from language import source_language
+from longform import transcribe_long
+from metrics import instrument, metrics, timed
+from preprocess import preprocess_audio_data
+from singleflight import SingleFlight
+from translation_memory import TranslationMemory, translate_segments
+from tts import SpeechSynthesizer
+
+# The translation pipeline without any UI: failures are raised, never shown. speech.py, cli.py
+# and server.py all drive these functions.
+
+load_dotenv()
+
+# Translation cache settings
+CACHE_DB = os.getenv("CACHE_DB", "cache.db")
+TRANSLATION_CACHE_MAX_BYTES = int(os.getenv("TRANSLATION_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+TRANSLATION_CACHE_TTL = int(os.getenv("TRANSLATION_CACHE_TTL", 7 * 24 * 3600))
+TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", 4))
+
+# Translation memory: exact and number-template sentence matches are served locally
+TRANSLATION_MEMORY = os.getenv("TRANSLATION_MEMORY", "1") == "1"
+TM_DB = os.getenv("TM_DB", "translation_memory.db")
+
+# Speech output cache settings
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+TTS_DISK_CACHE_MAX_BYTES = int(os.getenv("TTS_DISK_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+# Captured audio is resampled to 16 kHz, normalized and trimmed before it is uploaded
+AUDIO_PREPROCESSING = os.getenv("AUDIO_PREPROCESSING", "1") == "1"
+
+# Long recordings are cut into windows and recognized in parallel
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", 4))
+TRANSCRIPTION_WINDOW_SECONDS = float(os.getenv("TRANSCRIPTION_WINDOW_SECONDS", 30))
+
+AUDIO_EXTENSIONS = ("wav", "flac", "aiff", "aif")
+
+# Language options
+LANGUAGE_OPTIONS = {
+    'en': 'English',
+    'hi': 'Hindi',
+    'kn': 'Kannada',
+    'mr': 'Marathi',
+    'ta': 'Tamil',
+    'te': 'Telugu',
+    'bn': 'Bengali',
+    'gu': 'Gujarati',
+    'ml': 'Malayalam',
+    'pa': 'Punjabi'
+}
+
+# Speech recognition locale per input language
+SPEECH_LANG_CODES = {
+    'English': 'en-IN',
+    'Hindi': 'hi-IN',
+    'Kannada': 'kn-IN',
+    'Marathi': 'mr-IN',
+    'Tamil': 'ta-IN',
+    'Telugu': 'te-IN',
+    'Bengali': 'bn-IN',
+    'Gujarati': 'gu-IN',
+    'Malayalam': 'ml-IN',
+    'Punjabi': 'pa-IN'
+}
+
+# Shared resources, built once per process
+_shared = {}
+_shared_lock = threading.Lock()
+
+def _get_shared(name, factory):
+    with _shared_lock:
+        if name not in _shared:
+            _shared[name] = factory()
+        return _shared[name]
+
+def get_recognizer():
+    return _get_shared("recognizer", sr.Recognizer)
+
+def get_translation_cache():
+    return _get_shared("translation_cache", lambda: TieredCache(
+        CACHE_DB, "translations", max_bytes=TRANSLATION_CACHE_MAX_BYTES, ttl=TRANSLATION_CACHE_TTL))
+
+def get_translation_flight():
+    # Concurrent callers asking for the same translation wait on one backend call
+    return _get_shared("translation_flight", lambda: SingleFlight("translate"))
+
+def get_translation_memory():
+    return _get_shared("translation_memory", lambda: TranslationMemory(TM_DB))
+
+def get_speech_synthesizer():
+    def build():
+        cache = TieredCache(CACHE_DB, "speech",
+                            max_bytes=TTS_CACHE_MAX_BYTES,
+                            disk_max_bytes=TTS_DISK_CACHE_MAX_BYTES)
+        backend = get_speech_backend()
+        return SpeechSynthesizer(cache, instrument("synthesize")(backend.synthesize), engine=backend.name)
+    return _get_shared("speech_synthesizer", build)
+
+def speech_locale(input_lang):
+    # Accepts a language name ('Hindi') or code ('hi')
+    return SPEECH_LANG_CODES.get(LANGUAGE_OPTIONS.get(input_lang, input_lang), 'en-IN')
+
+# Speech recognition
+def prepare_audio(audio_data):
+    if not AUDIO_PREPROCESSING:
+        return audio_data
+    with timed("preprocess", payload_bytes=len(audio_data.frame_data)):
+        return preprocess_audio_data(audio_data)
+
+def recognize(audio, input_lang='English'):
+    # audio: AudioData, WAV/FLAC bytes or a file-like object; raises sr.UnknownValueError on silence
+    audio_data = prepare_audio(load_audio(audio, get_recognizer()))
+    if not audio_data.frame_data:
+        raise sr.UnknownValueError()
+    with timed("recognize", payload_bytes=len(audio_data.frame_data)):
+        return get_recognition_backend().recognize(audio_data, speech_locale(input_lang))
+
+def recognize_segment(samples, sample_rate, input_lang='English'):
+    # Unintelligible segments are None rather than an error, so one bad window does not sink a recording
+    audio_data = prepare_audio(samples_to_audio_data(samples, sample_rate))
+    if not audio_data.frame_data:
+        return None
+    try:
+        with timed("recognize", payload_bytes=len(audio_data.frame_data)):
+            return get_recognition_backend().recognize(audio_data, speech_locale(input_lang))
+    except sr.UnknownValueError:
+        return None
+
+def transcribe(source, input_lang='English', progress=None, check=None):
+    # Any length of WAV/FLAC/AIFF; check() runs before each window and may raise to stop early
+    def recognize_window(samples, sample_rate):
+        if check:
+            check()
+        return recognize_segment(samples, sample_rate, input_lang)
+    return transcribe_long(
+        source, recognize_window,
+        max_workers=TRANSCRIPTION_WORKERS,
+        window_s=TRANSCRIPTION_WINDOW_SECONDS,
+        progress=progress
+    )
+
+# Translation
+def _translate_uncached(cache, key, backend, text, target_language, source):
+    # An earlier flight may have just filled the cache; the miss was already counted
+    cached = cache.peek(key)
+    if cached is not None:
+        return cached
+    with timed("translate", payload_bytes=len(text.encode("utf-8"))):
+        translation = backend.translate(text, target_language, source)
+    if translation:
+        cache.set(key, translation)
+    return translation
+
+def translate_cached(text, target_language='en'):
+    with timed("detect"):
+        source = source_language(text)
+    if source == target_language:
+        # Already in the target language: no cache lookup, no provider round trip
+        return text
+    cache = get_translation_cache()
+    backend = get_translation_backend()
+    key = make_key(normalize_text(text), target_language, backend.name)
+    cached = cache.get(key)
+    metrics.record_cache("translate", cached is not None)
+    if cached is not None:
+        return cached
+    return get_translation_flight().do(key, _translate_uncached, cache, key, backend, text, target_language, source)
+
+def translate_with_memory(text, target_language):
+    # Sentences found in the translation memory are reused; runs of new ones go to the backend
+    source = source_language(text)
+    if not TRANSLATION_MEMORY or source == target_language:
+        return translate_cached(text, target_language)
+    translation, _ = translate_segments(
+        text, lambda run: translate_cached(run, target_language),
+        get_translation_memory(), source, target_language,
+        max_workers=TRANSLATION_WORKERS
+    )
+    return translation
+
+def translate_any(text, target_language):
+    if len(text) <= MAX_CHUNK_CHARS:
+        return translate_with_memory(text, target_language)
+    return translate_document(text, lambda chunk: translate_with_memory(chunk, target_language),
+                              max_workers=TRANSLATION_WORKERS)
+
+def translate_paragraphs(paragraphs, target_language, progress=None, check=None):
+    # Large documents are split into provider-sized chunks and translated in parallel;
+    # chunks are submitted while the rest of the input is still being read
+    return translate_chunks(
+        iter_chunks(paragraphs), lambda chunk: translate_with_memory(chunk, target_language),
+        max_workers=TRANSLATION_WORKERS,
+        progress=progress,
+        check=check
+    )
+
+def translate_source(source, target_language, progress=None, check=None):
+    # source: text, or a .txt/.docx/.pdf file object streamed paragraph by paragraph
+    if isinstance(source, str):
+        if len(source) <= MAX_CHUNK_CHARS:
+            return translate_with_memory(source, target_language)
+        source = source.split("\n")
+    else:
+        source = iter_paragraphs(source)
+    return translate_paragraphs(source, target_language, progress, check)
+
+# Speech output
+def synthesize(text, language_code):
+    return get_speech_synthesizer().synthesize(text, language_code)
+
+def speech_mime_type():
+    return get_speech_backend().mime_type
@@ -0,0 +1,81 @@
+import codecs
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+# Streaming text extraction: paragraphs are yielded as they are parsed, memory stays bounded
+
+SUPPORTED_EXTENSIONS = ("txt", "docx", "pdf")
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+class UnsupportedFileError(Exception):
+    pass
+
+def iter_txt_paragraphs(file, encoding="utf-8", block_size=64 * 1024):
+    # Incremental decoding, so multi-byte characters split across blocks survive
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+    while True:
+        block = file.read(block_size)
+        final = not block
+        pending += decoder.decode(block, final=final)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+        if final:
+            break
+    if pending:
+        yield pending.rstrip("\r")
+
+def iter_docx_paragraphs(file):
+    # Walks word/document.xml with iterparse instead of building the whole python-docx tree
+    with zipfile.ZipFile(file) as archive:
+        with archive.open("word/document.xml") as xml:
+            parts = []
+            for event, element in iterparse(xml, events=("end",)):
+                tag = element.tag
+                if tag == WORD_NS + "t":
+                    parts.append(element.text or "")
+                elif tag == WORD_NS + "tab":
+                    parts.append("\t")
+                elif tag in (WORD_NS + "br", WORD_NS + "cr"):
+                    parts.append("\n")
+                elif tag == WORD_NS + "p":
+                    yield "".join(parts)
+                    parts = []
+                    element.clear()
+                elif tag == WORD_NS + "body":
+                    element.clear()
+
+def iter_pdf_paragraphs(file):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise UnsupportedFileError("PDF support needs the 'pypdf' package")
+    for page in PdfReader(file).pages:
+        for line in (page.extract_text() or "").split("\n"):
+            yield line
+
+def iter_paragraphs(file, name=None):
+    name = (name or getattr(file, "name", "")).lower()
+    if hasattr(file, "seek"):
+        file.seek(0)
+    extension = name.rsplit(".", 1)[-1] if "." in name else ""
+    if extension == "txt":
+        return iter_txt_paragraphs(file)
+    if extension == "docx":
+        return iter_docx_paragraphs(file)
+    if extension == "pdf":
+        return iter_pdf_paragraphs(file)
+    raise UnsupportedFileError("Unsupported file format")
+
+def preview(paragraphs, max_chars=1000):
+    # Reads only as much of the stream as the preview needs
+    parts, size = [], 0
+    for paragraph in paragraphs:
+        parts.append(paragraph)
+        size += len(paragraph) + 1
+        if size > max_chars:
+            return "\n".join(parts)[:max_chars], True
+    return "\n".join(parts), False
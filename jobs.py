@@ -0,0 +1,135 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Background jobs shared by every session of the process
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    def __init__(self, name, owner=None, kind=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.owner = owner
+        self.kind = kind
+        self.status = QUEUED
+        self.done_steps = 0
+        self.total_steps = None
+        self.message = ""
+        self.partial_results = []
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    # Called from the worker
+    def report(self, done, total=None, message=None):
+        with self._lock:
+            self.done_steps = done
+            if total is not None:
+                self.total_steps = total
+            if message is not None:
+                self.message = message
+
+    def emit(self, item):
+        with self._lock:
+            self.partial_results.append(item)
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    # Called from the UI
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def progress(self):
+        if self.status == DONE:
+            return 1.0
+        if not self.total_steps:
+            return 0.0
+        return min(1.0, self.done_steps / self.total_steps)
+
+    def partial(self, start=0):
+        with self._lock:
+            return list(self.partial_results[start:])
+
+class JobManager:
+    def __init__(self, max_workers=4, keep_seconds=3600):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.keep_seconds = keep_seconds
+        self._jobs = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, name, fn, *args, owner=None, kind=None, **kwargs):
+        # fn(job, *args, **kwargs) runs on a worker; its return value becomes job.result
+        job = Job(name, owner, kind)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+            self._futures[job.id] = self.executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancelled:
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = CANCELLED if job.cancelled else DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            if job.cancelled:
+                job.status = CANCELLED
+            else:
+                job.error = str(e)
+                job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job._cancel.set()
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+        return True
+
+    def list(self, owner=None):
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if owner is None or job.owner == owner]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def _prune(self):
+        cutoff = time.time() - self.keep_seconds
+        for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished_at < cutoff]:
+            self._jobs.pop(job_id, None)
+            self._futures.pop(job_id, None)
@@ -0,0 +1,85 @@
+import re
+
+import numpy as np
+
+# Local language identification: Unicode script first, then marker words where a script is shared
+
+# Indic scripts sit in 128-code-point blocks, so a code point's block is simply cp >> 7
+SCRIPT_BLOCKS = {
+    0x0900 >> 7: "devanagari",
+    0x0980 >> 7: "bn",
+    0x0A00 >> 7: "pa",
+    0x0A80 >> 7: "gu",
+    0x0B80 >> 7: "ta",
+    0x0C00 >> 7: "te",
+    0x0C80 >> 7: "kn",
+    0x0D00 >> 7: "ml",
+}
+
+WORD = re.compile(r"[\w\u0900-\u0dff]+")
+
+# Frequent words that tell languages sharing a script apart
+MARKERS = {
+    "hi": frozenset("है हैं था थे थी का की के में और से को नहीं यह वह भी पर लिए कि ने हम आप".split()),
+    "mr": frozenset("आहे आहेत होते होता आणि नाही हे ते मी तुम्ही आम्ही काय चा ची चे ला ना मध्ये साठी पण".split()),
+}
+# Latin text is only called English with evidence; romanized Hindi is Latin too
+ENGLISH_WORDS = frozenset("""
+the a an and or but of to in on at for with from by is are was were be been it this that
+these those i you he she we they my your his her our their not no do does did have has had
+will would can could should what which who how when where why there here as if so all
+hello hi thanks thank please yes good
+""".split())
+
+SAMPLE_CHARS = 2000
+MIN_CONFIDENCE = 0.8
+MIN_ENGLISH_HITS = 2
+
+def _script_counts(text):
+    code_points = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    blocks = np.bincount(code_points >> 7, minlength=(0x0D00 >> 7) + 1)
+    counts = {script: int(blocks[block]) for block, script in SCRIPT_BLOCKS.items()}
+    counts["latin"] = sum(1 for c in text if c.isascii() and c.isalpha())
+    return counts
+
+def _devanagari(words):
+    # Hindi unless Marathi markers win; without markers either way the call is unsure
+    scores = {code: sum(w in markers for w in words) for code, markers in MARKERS.items()}
+    hits = scores["hi"] + scores["mr"]
+    if not hits:
+        return "hi", 0.5
+    code = "mr" if scores["mr"] > scores["hi"] else "hi"
+    return code, scores[code] / hits
+
+def _latin(words):
+    if not words:
+        return None, 0.0
+    hits = sum(w in ENGLISH_WORDS for w in words)
+    share = hits / len(words)
+    if hits < MIN_ENGLISH_HITS:
+        # One English-looking token ("hi kaise ho", "no problema") is not evidence enough
+        return "en", min(share, 0.5)
+    # Running English text is roughly half function words; short phrases are denser in them
+    return "en", min(1.0, share * (2 if len(words) > 3 else 4))
+
+def detect(text):
+    # (language code, confidence in [0, 1]); code is None when nothing recognisable was found
+    sample = text[:SAMPLE_CHARS]
+    counts = _script_counts(sample)
+    script = max(counts, key=counts.get)
+    letters = sum(counts.values())
+    if not counts[script]:
+        return None, 0.0
+    share = counts[script] / letters
+    if script == "devanagari":
+        code, certainty = _devanagari(WORD.findall(sample))
+    elif script == "latin":
+        code, certainty = _latin(WORD.findall(sample.lower()))
+    else:
+        code, certainty = script, 1.0
+    return code, share * certainty
+
+def source_language(text, min_confidence=MIN_CONFIDENCE):
+    # The code to send as an explicit source, or 'auto' to leave detection to the provider
+    code, confidence = detect(text)
+    return code if code and confidence >= min_confidence else "auto"
@@ -0,0 +1,138 @@
+import io
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import speech_recognition as sr
+
+from audio_io import open_audio_file
+
+# Long recordings: cut at pauses into windows, recognize them in parallel, stitch the text back
+
+WORD = re.compile(r"[\w']+")
+
+def iter_blocks(audio_file, block_seconds=10):
+    # Mono int16 blocks from an open sr.AudioFile, so the whole recording is never decoded at once
+    frames = int(audio_file.SAMPLE_RATE * block_seconds)
+    while True:
+        data = audio_file.stream.read(frames)
+        if not data:
+            return
+        raw = sr.AudioData(data, audio_file.SAMPLE_RATE, audio_file.SAMPLE_WIDTH).get_raw_data(convert_width=2)
+        yield np.frombuffer(raw, dtype=np.int16)
+
+def _frame_rms(samples, frame_len):
+    n = len(samples) // frame_len
+    frames = samples[:n * frame_len].astype(np.float32).reshape(n, frame_len)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+def iter_windows(blocks, sample_rate, window_s=30, overlap_s=1.5, search_s=5, frame_ms=30,
+                 silence_threshold=500.0):
+    # Yields (end_sample, samples, overlapped). Each window ends at the quietest frame of its
+    # last search_s seconds; when even that frame is speech, the next window starts overlap_s
+    # earlier so a word cut in half is heard whole by one of them. Silent windows are skipped.
+    window = int(window_s * sample_rate)
+    search = int(search_s * sample_rate)
+    overlap = int(overlap_s * sample_rate)
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    buffer = np.zeros(0, dtype=np.int16)
+    offset = 0
+    overlapped = False
+    for block in blocks:
+        buffer = np.concatenate((buffer, block))
+        while len(buffer) >= window:
+            rms = _frame_rms(buffer[window - search:window], frame_len)
+            quietest = int(np.argmin(rms))
+            cut = window - search + quietest * frame_len + frame_len // 2
+            samples = buffer[:cut]
+            if _frame_rms(samples, frame_len).max(initial=0) >= silence_threshold:
+                yield offset + cut, samples, overlapped
+            keep = cut if rms[quietest] < silence_threshold else max(0, cut - overlap)
+            overlapped = keep < cut
+            buffer = buffer[keep:]
+            offset += keep
+    if len(buffer) and _frame_rms(buffer, frame_len).max(initial=0) >= silence_threshold:
+        yield offset + len(buffer), buffer, overlapped
+
+def transcribe_windows(windows, recognize_fn, max_workers=4, progress=None):
+    # recognize_fn(samples) -> text or None; at most 2 * max_workers windows are held in memory
+    results = []
+    pending = deque()
+
+    def collect():
+        end, overlapped, future = pending.popleft()
+        results.append((future.result() or "", overlapped))
+        if progress:
+            progress(end)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for end, samples, overlapped in windows:
+                pending.append((end, overlapped, executor.submit(recognize_fn, samples)))
+                while len(pending) >= 2 * max_workers:
+                    collect()
+            while pending:
+                collect()
+        except BaseException:
+            for _, _, future in pending:
+                future.cancel()
+            raise
+    return results
+
+def _overlap_length(previous, current, max_words, min_words):
+    # Longest run of words ending `previous` that also starts `current`
+    def norm(words):
+        return [" ".join(WORD.findall(w.lower())) for w in words]
+    for n in range(min(max_words, len(previous), len(current)), min_words - 1, -1):
+        if norm(previous[-n:]) == norm(current[:n]):
+            return n
+    return 0
+
+def merge_transcripts(results, max_overlap_words=12, min_overlap_words=2):
+    # results: (text, overlapped) per window; only windows that share audio are de-duplicated
+    words = []
+    for text, overlapped in results:
+        current = text.split()
+        if overlapped and words:
+            current = current[_overlap_length(words, current, max_overlap_words, min_overlap_words):]
+        words.extend(current)
+    return " ".join(words)
+
+def _open(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+def silence_threshold(audio_file, frame_ms=30, percentile=95, relative_db=-20.0, floor=20.0):
+    # Frame RMS level that counts as silence for this recording: relative_db below its loud
+    # frames, so a quietly recorded file is not skipped as silent from start to end
+    frame_len = max(1, int(audio_file.SAMPLE_RATE * frame_ms / 1000))
+    levels = [_frame_rms(block, frame_len) for block in iter_blocks(audio_file)]
+    levels = np.concatenate(levels) if levels else np.zeros(0)
+    if not len(levels):
+        return floor
+    return max(floor, float(np.percentile(levels, percentile)) * 10 ** (relative_db / 20))
+
+def transcribe_long(source, recognize_fn, max_workers=4, window_s=30, overlap_s=1.5, progress=None):
+    # source: WAV/FLAC/AIFF path, bytes or file-like; recognize_fn(samples, sample_rate) -> text or None;
+    # progress(done_seconds, total_seconds). Raises sr.UnknownValueError when nothing was recognized.
+    # A first pass over the file sets the silence level, the second one transcribes.
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = bytes(source)
+    with open_audio_file(_open(source)) as audio_file:
+        threshold = silence_threshold(audio_file)
+    with open_audio_file(_open(source)) as audio_file:
+        rate = audio_file.SAMPLE_RATE
+        duration = audio_file.DURATION
+        windows = iter_windows(iter_blocks(audio_file), rate, window_s, overlap_s, silence_threshold=threshold)
+        results = transcribe_windows(
+            windows, lambda samples: recognize_fn(samples, rate), max_workers,
+            progress=progress and (lambda end: progress(min(duration, end / rate), duration))
+        )
+    text = merge_transcripts(results)
+    if not text:
+        raise sr.UnknownValueError("No speech recognized in the recording")
+    return text
@@ -0,0 +1,190 @@
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency buckets in seconds, Prometheus-style (cumulative on export)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.payload_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.flights = 0
+        self.coalesced = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+# In-process store for durations, payload sizes, cache hits and errors per operation
+class MetricsStore:
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms.setdefault(name, Histogram())
+        return histogram
+
+    def observe(self, name, seconds, payload_bytes=0, error=False):
+        with self._lock:
+            histogram = self._get(name)
+            histogram.observe(seconds)
+            histogram.payload_bytes += payload_bytes
+            if error:
+                histogram.errors += 1
+
+    def record_cache(self, name, hit):
+        with self._lock:
+            histogram = self._get(name)
+            if hit:
+                histogram.cache_hits += 1
+            else:
+                histogram.cache_misses += 1
+
+    def record_coalesce(self, name, coalesced):
+        with self._lock:
+            histogram = self._get(name)
+            if coalesced:
+                histogram.coalesced += 1
+            else:
+                histogram.flights += 1
+
+    def snapshot(self):
+        with self._lock:
+            rows = []
+            for name, h in sorted(self._histograms.items()):
+                rows.append({
+                    "operation": name,
+                    "count": h.count,
+                    "errors": h.errors,
+                    "mean_ms": h.sum / h.count * 1000 if h.count else None,
+                    "p50_ms": h.quantile(0.5) * 1000 if h.count else None,
+                    "p95_ms": h.quantile(0.95) * 1000 if h.count else None,
+                    "max_ms": h.max * 1000,
+                    "payload_bytes": h.payload_bytes,
+                    "cache_hits": h.cache_hits,
+                    "cache_misses": h.cache_misses,
+                    "coalesced": h.coalesced,
+                    "coalescing_ratio": h.coalesced / (h.flights + h.coalesced) if h.coalesced else 0.0,
+                })
+            return rows
+
+    def to_prometheus(self, prefix="voice_translator"):
+        lines = [
+            f"# HELP {prefix}_duration_seconds Time spent per operation",
+            f"# TYPE {prefix}_duration_seconds histogram",
+        ]
+        with self._lock:
+            items = sorted(self._histograms.items())
+            for name, h in items:
+                cumulative = 0
+                for bound, n in zip(BUCKETS, h.counts):
+                    cumulative += n
+                    lines.append(f'{prefix}_duration_seconds_bucket{{op="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_duration_seconds_bucket{{op="{name}",le="+Inf"}} {h.count}')
+                lines.append(f'{prefix}_duration_seconds_sum{{op="{name}"}} {h.sum}')
+                lines.append(f'{prefix}_duration_seconds_count{{op="{name}"}} {h.count}')
+            for metric, attr, help_text in (
+                    ("errors_total", "errors", "Failed operations"),
+                    ("payload_bytes_total", "payload_bytes", "Bytes processed per operation"),
+                    ("cache_hits_total", "cache_hits", "Cache hits per operation"),
+                    ("cache_misses_total", "cache_misses", "Cache misses per operation"),
+                    ("flights_total", "flights", "Calls that reached the backend after coalescing"),
+                    ("coalesced_total", "coalesced", "Calls served by an identical in-flight call")):
+                lines.append(f"# HELP {prefix}_{metric} {help_text}")
+                lines.append(f"# TYPE {prefix}_{metric} counter")
+                for name, h in items:
+                    lines.append(f'{prefix}_{metric}{{op="{name}"}} {getattr(h, attr)}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+metrics = MetricsStore()
+
+# Tracing helpers
+class Span:
+    def __init__(self):
+        self.payload_bytes = 0
+
+@contextmanager
+def timed(name, payload_bytes=0, store=None):
+    store = store or metrics
+    span = Span()
+    span.payload_bytes = payload_bytes
+    start = time.perf_counter()
+    try:
+        yield span
+    except Exception:
+        store.observe(name, time.perf_counter() - start, span.payload_bytes, error=True)
+        raise
+    store.observe(name, time.perf_counter() - start, span.payload_bytes)
+
+def payload_size(value):
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return 0
+
+def instrument(name, store=None):
+    # Records duration, errors and the size of the returned payload
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(name, store=store) as span:
+                result = fn(*args, **kwargs)
+                span.payload_bytes = payload_size(result)
+                return result
+        return wrapper
+    return decorator
+
+# Optional /metrics endpoint for scrapers
+def start_metrics_server(port, host="0.0.0.0", store=None):
+    store = store or metrics
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = store.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-server").start()
+    return server
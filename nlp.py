@@ -0,0 +1,81 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+from segments import segment
+
+# Word characters plus Indic combining marks, which \w alone splits on
+TOKEN = re.compile(r"[\w\u0900-\u0dff]+")
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just me more most
+my myself no nor not now of off on once only or other our ours ourselves out over own same she should
+so some such than that the their theirs them themselves then there these they this those through to
+too under until up very was we were what when where which while who whom why will with would you
+your yours yourself yourselves also may might must shall us one two get got like even much many
+""".split())
+
+def tokenize(text):
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS and not t.isdigit()]
+
+@lru_cache(maxsize=32)
+def _analyze(text):
+    # Sentence-by-term TF-IDF matrix (rows L2-normalized), the sentence texts and the terms.
+    # Term ids are local to this text, so nothing outlives the cache entry.
+    sentences = [s for s, _ in segment(text) if s.strip()]
+    ids = {}
+    rows, cols = [], []
+    for i, sentence in enumerate(sentences):
+        tokens = tokenize(sentence)
+        rows.extend([i] * len(tokens))
+        cols.extend(ids.setdefault(token, len(ids)) for token in tokens)
+    n_terms = len(ids)
+    counts = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                               shape=(len(sentences), n_terms))
+    counts.sum_duplicates()
+    # Smoothed IDF over the sentences of this text
+    df = np.bincount(counts.indices, minlength=n_terms).astype(np.float32)
+    idf = np.log((1 + len(sentences)) / (1 + df)) + 1
+    tfidf = counts.multiply(idf).tocsr()
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    tfidf = sparse.diags(1 / norms) @ tfidf
+    return sentences, tfidf.tocsr(), list(ids)
+
+def textrank(matrix, damping=0.85, iterations=50, tol=1e-6):
+    # PageRank over cosine similarity without materializing the n x n matrix:
+    # S @ y = X @ (X.T @ y) - y   (rows of X have unit norm, self-similarity removed)
+    n = matrix.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    xt = matrix.T.tocsr()
+    degree = matrix @ (xt @ np.ones(n)) - 1
+    degree[degree <= 1e-12] = 1
+    scores = np.full(n, 1 / n)
+    for _ in range(iterations):
+        y = scores / degree
+        updated = (1 - damping) / n + damping * (matrix @ (xt @ y) - y)
+        if np.abs(updated - scores).sum() < tol:
+            return updated
+        scores = updated
+    return scores
+
+def summarize(text, num_sentences=3):
+    sentences, matrix, _ = _analyze(text)
+    if len(sentences) <= num_sentences:
+        return " ".join(sentences)
+    scores = textrank(matrix)
+    top = np.argsort(-scores, kind="stable")[:num_sentences]
+    return " ".join(sentences[i] for i in sorted(top))
+
+def extract_keywords(text, top_k=10):
+    sentences, matrix, terms = _analyze(text)
+    if matrix.nnz == 0:
+        return []
+    scores = np.asarray(matrix.sum(axis=0)).ravel()
+    top = np.argsort(-scores, kind="stable")[:top_k]
+    return [terms[i] for i in top if scores[i] > 0]
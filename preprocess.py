@@ -0,0 +1,81 @@
+from math import gcd
+
+import numpy as np
+
+from audio_io import samples_to_audio_data
+
+# Conditioning between capture and recognition: speech needs 16 kHz, not the 44.1 kHz we record
+
+TARGET_RATE = 16000
+
+# A clip whose loudest 20 ms frame is below this RMS (int16, about -50 dBFS) is silence or hiss.
+# Checked on the raw signal, before normalization can raise its level.
+SILENCE_RMS = 100.0
+
+def resample(samples, sample_rate, target_rate=TARGET_RATE):
+    # Polyphase filter: anti-aliased and far cheaper than an FFT resample on long clips
+    if sample_rate == target_rate or not len(samples):
+        return samples.astype(np.float32)
+    from scipy.signal import resample_poly
+    g = gcd(sample_rate, target_rate)
+    return resample_poly(samples.astype(np.float32), target_rate // g, sample_rate // g).astype(np.float32)
+
+def remove_dc(samples):
+    return samples - samples.mean() if len(samples) else samples
+
+def normalize(samples, peak=0.9 * 32767, max_gain=10.0):
+    # Scale to a common peak; gain is capped so near-silence is not blown up into noise
+    level = np.abs(samples).max() if len(samples) else 0
+    if not level:
+        return samples
+    return samples * min(max_gain, peak / level)
+
+def frame_rms(samples, sample_rate, frame_ms=20):
+    # RMS of each whole frame; a clip shorter than one frame counts as one frame
+    frame_len = min(len(samples), max(1, int(sample_rate * frame_ms / 1000)))
+    if not frame_len:
+        return np.zeros(0, dtype=np.float32)
+    n = len(samples) // frame_len
+    frames = np.asarray(samples[:n * frame_len], dtype=np.float32).reshape(n, frame_len)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+def is_silent(samples, sample_rate, floor=SILENCE_RMS, frame_ms=20):
+    rms = frame_rms(samples, sample_rate, frame_ms)
+    return not len(rms) or rms.max() < floor
+
+def trim_silence(samples, sample_rate, frame_ms=20, relative_db=-30.0, pad_ms=150):
+    # Drops leading and trailing frames more than relative_db below the loudest frame. The level
+    # is relative only, so a quiet but clean recording is trimmed the same way as a loud one;
+    # silent clips are caught by is_silent before normalization.
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    if len(samples) < frame_len:
+        return samples
+    rms = frame_rms(samples, sample_rate, frame_ms)
+    loud = np.flatnonzero(rms >= rms.max() * 10 ** (relative_db / 20))
+    if not rms.max() or not len(loud):
+        return samples
+    pad = int(sample_rate * pad_ms / 1000)
+    start = max(0, loud[0] * frame_len - pad)
+    end = min(len(samples), (loud[-1] + 1) * frame_len + pad)
+    return samples[start:end]
+
+def preprocess(samples, sample_rate, target_rate=TARGET_RATE, trim=True):
+    # int16 samples in, int16 samples at target_rate out. With trim, a silent clip comes back
+    # empty; otherwise trimming runs on the normalized signal and never leaves less than the
+    # loudest stretch of the clip.
+    x = remove_dc(np.asarray(samples, dtype=np.float32).reshape(-1))
+    if trim and is_silent(x, sample_rate):
+        return np.zeros(0, dtype=np.int16), target_rate
+    x = normalize(resample(x, sample_rate, target_rate))
+    if trim:
+        x = trim_silence(x, target_rate)
+    return np.clip(np.rint(x), -32768, 32767).astype(np.int16), target_rate
+
+def preprocess_audio_data(audio_data, target_rate=TARGET_RATE, trim=True):
+    samples = np.frombuffer(audio_data.get_raw_data(convert_width=2), dtype=np.int16)
+    processed, rate = preprocess(samples, audio_data.sample_rate, target_rate, trim)
+    return samples_to_audio_data(processed, rate)
+
+def flac_bytes(audio_data):
+    # What recognize_google uploads; encoding needs the flac binary bundled with speech_recognition
+    return audio_data.get_flac_data(convert_width=2)
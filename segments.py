@@ -0,0 +1,88 @@
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from cache import make_key, normalize_text
+from documents import MAX_CHUNK_CHARS, ChunkTranslationError
+
+# Sentence and line boundaries, kept so the translation has the same layout
+BOUNDARY = re.compile(r'(\s*\n\s*|(?<=[.!?।॥])\s+)')
+
+def segment(text):
+    # [(sentence, separator_after), ...]
+    parts = BOUNDARY.split(text)
+    parts.append("")
+    return [(parts[i], parts[i + 1]) for i in range(0, len(parts) - 1, 2)]
+
+# Per-session memory of already translated sentences
+class SegmentStore:
+    def __init__(self, max_segments=5000):
+        self.max_segments = max_segments
+        self._segments = OrderedDict()
+
+    def get(self, key):
+        value = self._segments.get(key)
+        if value is not None:
+            self._segments.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._segments[key] = value
+        self._segments.move_to_end(key)
+        while len(self._segments) > self.max_segments:
+            self._segments.popitem(last=False)
+
+    def __len__(self):
+        return len(self._segments)
+
+def _runs(indices, segments, max_chars):
+    # Consecutive sentences go out together, up to max_chars per request
+    runs, run, run_chars = [], [], 0
+    for i in indices:
+        size = len(segments[i][0]) + len(segments[i][1])
+        if run and (i != run[-1] + 1 or run_chars + size > max_chars):
+            runs.append(run)
+            run, run_chars = [], 0
+        run.append(i)
+        run_chars += size
+    if run:
+        runs.append(run)
+    return runs
+
+def translate_incremental(text, target_language, translate_fn, store, max_workers=4, max_chars=MAX_CHUNK_CHARS):
+    # Only sentences not seen before for this target go to translate_fn, one request per run of them
+    segments = segment(text)
+    keys = [make_key(normalize_text(sentence), target_language) if sentence.strip() else None
+            for sentence, _ in segments]
+    # Output pieces of this call; the store may evict entries before the output is put together
+    pieces = [None] * len(segments)
+    for i, (key, (sentence, sep)) in enumerate(zip(keys, segments)):
+        cached = store.get(key) if key is not None else sentence
+        if cached is not None:
+            pieces[i] = cached + sep
+    missing = [i for i, piece in enumerate(pieces) if piece is None]
+    runs = _runs(missing, segments, max_chars)
+
+    def translate_run(index, run):
+        source = "".join(segments[i][0] + (segments[i][1] if i != run[-1] else "") for i in run)
+        translation = translate_fn(source)
+        if not translation or not translation.strip():
+            raise ChunkTranslationError(index, "empty translation")
+        return translation
+
+    if runs:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            translations = executor.map(translate_run, range(len(runs)), runs)
+            for run, translation in zip(runs, translations):
+                parts = [s for s, _ in segment(translation) if s.strip()]
+                if len(parts) == len(run):
+                    for i, part in zip(run, parts):
+                        pieces[i] = part + segments[i][1]
+                        store.set(keys[i], part)
+                else:
+                    # Sentence boundaries were not kept: the run is used as a whole, in this call only
+                    pieces[run[0]] = translation + segments[run[-1]][1]
+                    for i in run[1:]:
+                        pieces[i] = ""
+    reused = sum(1 for key in keys if key is not None) - len(missing)
+    return "".join(pieces), {"segments": len(segments), "translated": len(missing), "reused": reused}
@@ -0,0 +1,113 @@
+import os
+import re
+
+import numpy as np
+
+# Lexicon-based sentiment scoring with a compiled hash table
+
+LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sentiment_lexicon.tsv")
+
+TOKEN = re.compile(r"[\w\u0900-\u0dff']+")
+
+NEGATORS = frozenset("not no never none nobody nothing neither nor cannot without hardly".split())
+# Hindi negation follows the word it negates ("अच्छा नहीं")
+POST_NEGATORS = frozenset("नहीं ना मत".split())
+NEGATION_WINDOW = 3
+NEGATION_SCALE = -0.74
+
+def _token_hashes(tokens):
+    return np.fromiter((hash(t) for t in tokens), dtype=np.int64, count=len(tokens))
+
+def _is_negator(token):
+    return token in NEGATORS or token.endswith("n't")
+
+# word -> score, held as two parallel arrays (sorted 64-bit hashes, float32 scores)
+class Lexicon:
+    def __init__(self, entries):
+        hashes = _token_hashes([w for w, _ in entries])
+        scores = np.array([s for _, s in entries], dtype=np.float32)
+        order = np.argsort(hashes)
+        self.hashes = hashes[order]
+        self.scores = scores[order]
+
+    @classmethod
+    def load(cls, path=None):
+        entries = []
+        with open(path or os.getenv("SENTIMENT_LEXICON", LEXICON_PATH), encoding="utf-8") as f:
+            for line in f:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                word, score = line.rstrip("\n").split("\t")[:2]
+                entries.append((word.lower(), float(score)))
+        return cls(entries)
+
+    def lookup(self, hashes):
+        if not len(self.hashes):
+            return np.zeros(len(hashes), dtype=np.float32)
+        positions = np.searchsorted(self.hashes, hashes).clip(max=len(self.hashes) - 1)
+        found = self.hashes[positions] == hashes
+        return np.where(found, self.scores[positions], 0).astype(np.float32)
+
+    def __len__(self):
+        return len(self.hashes)
+
+_lexicon = None
+
+def get_lexicon():
+    global _lexicon
+    if _lexicon is None:
+        _lexicon = Lexicon.load()
+    return _lexicon
+
+def _token_scores(tokens, lexicon):
+    # One pass: look every token up, then flip words within a few tokens of a negator
+    n = len(tokens)
+    scores = lexicon.lookup(_token_hashes(tokens))
+    kernel = np.ones(NEGATION_WINDOW + 1, dtype=np.float32)
+    negators = np.fromiter((_is_negator(t) for t in tokens), dtype=np.float32, count=n)
+    post_negators = np.fromiter((t in POST_NEGATORS for t in tokens), dtype=np.float32, count=n)
+    negated = np.zeros(n, dtype=bool)
+    if negators.any():
+        negated |= np.convolve(negators, kernel)[:n] - negators > 0
+    if post_negators.any():
+        negated |= np.convolve(post_negators[::-1], kernel)[:n][::-1] - post_negators > 0
+    return np.where(negated, scores * NEGATION_SCALE, scores)
+
+def _normalize(total):
+    # Squash an unbounded sum into (-1, 1)
+    return total / np.sqrt(total * total + 15)
+
+def label(compound, threshold=0.05):
+    if compound >= threshold:
+        return "positive"
+    if compound <= -threshold:
+        return "negative"
+    return "neutral"
+
+def analyze(text, lexicon=None):
+    lexicon = lexicon or get_lexicon()
+    tokens = TOKEN.findall(text.lower())
+    scores = _token_scores(tokens, lexicon)
+    compound = float(_normalize(scores.sum())) if len(scores) else 0.0
+    return {
+        "label": label(compound),
+        "compound": compound,
+        "positive": int((scores > 0).sum()),
+        "negative": int((scores < 0).sum()),
+        "tokens": len(tokens),
+    }
+
+def analyze_batch(texts, lexicon=None):
+    # All documents are scored in one vectorized pass, then summed per document
+    lexicon = lexicon or get_lexicon()
+    tokens, doc_ids = [], []
+    for i, text in enumerate(texts):
+        doc_tokens = TOKEN.findall(text.lower())
+        tokens.extend(doc_tokens)
+        doc_ids.extend([i] * len(doc_tokens))
+        # A sentinel keeps negation from leaking into the next document
+        tokens.extend([""] * NEGATION_WINDOW)
+        doc_ids.extend([i] * NEGATION_WINDOW)
+    scores = _token_scores(tokens, lexicon) if tokens else np.zeros(0, dtype=np.float32)
+    totals = np.bincount(np.array(doc_ids, dtype=np.int64), weights=scores, minlength=len(texts))
+    return _normalize(totals)
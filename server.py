@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+import speech_recognition as sr
+from dotenv import load_dotenv
+
+import engine
+from audio_io import UnreadableAudioError
+from documents import ChunkTranslationError
+from metrics import metrics
+from transport import CircuitOpenError
+
+# Headless HTTP API on asyncio streams: connections are cheap coroutines, the blocking pipeline
+# runs on a bounded thread pool.
+#   POST /translate   {"text": "...", "target": "hi"} or {"texts": [...], "target": "hi"}
+#   POST /transcribe  WAV/FLAC body, ?language=Hindi
+#   POST /synthesize  {"text": "...", "language": "hi"} -> audio
+#   GET  /health, GET /metrics
+
+load_dotenv()
+
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", 8000))
+API_WORKERS = int(os.getenv("API_WORKERS", 8))
+API_MAX_BODY_BYTES = int(os.getenv("API_MAX_BODY_BYTES", 25 * 1024 * 1024))
+# Texts accepted in one {"texts": [...]} request; each one is a pipeline call
+API_MAX_BATCH = int(os.getenv("API_MAX_BATCH", 100))
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error",
+           502: "Bad Gateway", 503: "Service Unavailable"}
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _json_body(body):
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "Body is not valid JSON")
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "Body must be a JSON object")
+    return payload
+
+def _error_status(error):
+    # HTTP status for an exception raised by the pipeline; None for a bug on our side
+    if isinstance(error, ChunkTranslationError):
+        error = error.error if isinstance(error.error, BaseException) else error
+    if isinstance(error, sr.UnknownValueError):
+        return 422
+    if isinstance(error, CircuitOpenError):
+        return 503
+    from deep_translator import exceptions as translator_errors
+    from gtts.tts import gTTSError
+    if isinstance(error, (translator_errors.NotValidPayload, translator_errors.NotValidLength,
+                          translator_errors.LanguageNotSupportedException,
+                          translator_errors.InvalidSourceOrTargetLanguage)):
+        return 400
+    # Not every deep_translator exception derives from its BaseError (TooManyRequests does not)
+    if (isinstance(error, (requests.RequestException, sr.RequestError, gTTSError, ChunkTranslationError))
+            or type(error).__module__ == translator_errors.__name__):
+        return 502
+    return None
+
+def _language(value, field):
+    if value not in engine.LANGUAGE_OPTIONS:
+        raise HTTPError(400, f"'{field}' must be one of {', '.join(engine.LANGUAGE_OPTIONS)}")
+    return value
+
+class APIServer:
+    def __init__(self, workers=API_WORKERS, max_body_bytes=API_MAX_BODY_BYTES, max_batch=API_MAX_BATCH):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+        self.max_body_bytes = max_body_bytes
+        self.max_batch = max_batch
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/metrics"): self.metrics,
+            ("POST", "/translate"): self.translate,
+            ("POST", "/transcribe"): self.transcribe,
+            ("POST", "/synthesize"): self.synthesize,
+        }
+
+    async def run_blocking(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def health(self, query, body):
+        return 200, "application/json", {"status": "ok"}
+
+    async def metrics(self, query, body):
+        return 200, "text/plain; version=0.0.4", metrics.to_prometheus()
+
+    async def translate(self, query, body):
+        payload = _json_body(body)
+        target = _language(payload.get("target"), "target")
+        if isinstance(payload.get("texts"), list):
+            # Items of a batch run side by side; repeats coalesce in the engine
+            texts = payload["texts"]
+            if not all(isinstance(text, str) for text in texts):
+                raise HTTPError(400, "'texts' must be a list of strings")
+            if len(texts) > self.max_batch:
+                raise HTTPError(413, f"'texts' holds more than {self.max_batch} items")
+            translations = await asyncio.gather(*(self.run_blocking(engine.translate_any, text, target)
+                                                  for text in texts))
+            return 200, "application/json", {"target": target, "translations": translations}
+        if not isinstance(payload.get("text"), str):
+            raise HTTPError(400, "'text' or 'texts' is required")
+        translation = await self.run_blocking(engine.translate_any, payload["text"], target)
+        return 200, "application/json", {"target": target, "translation": translation}
+
+    async def transcribe(self, query, body):
+        if not body:
+            raise HTTPError(400, "Send WAV, FLAC or AIFF audio as the request body")
+        language = query.get("language", ["English"])[0]
+        try:
+            text = await self.run_blocking(engine.transcribe, body, language)
+        except UnreadableAudioError as e:
+            raise HTTPError(400, str(e))
+        return 200, "application/json", {"language": language, "text": text}
+
+    async def synthesize(self, query, body):
+        payload = _json_body(body)
+        if not isinstance(payload.get("text"), str) or not payload["text"].strip():
+            raise HTTPError(400, "'text' is required")
+        language = _language(payload.get("language"), "language")
+        audio = await self.run_blocking(engine.synthesize, payload["text"], language)
+        return 200, engine.speech_mime_type(), audio
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            allowed = [m for m, path in self.routes if path == url.path]
+            raise HTTPError(405 if allowed else 404, f"{method} {url.path} is not supported")
+        try:
+            return await handler(parse_qs(url.query), body)
+        except HTTPError:
+            raise
+        except Exception as e:
+            status = _error_status(e)
+            if status is None:
+                raise
+            raise HTTPError(status, "Could not understand audio" if status == 422 else str(e) or type(e).__name__)
+
+    async def read_request(self, reader):
+        # (method, target, headers, body), or None once the client has gone
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise HTTPError(413, f"Body is larger than {self.max_body_bytes} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def handle(self, reader, writer):
+        # HTTP/1.1 keep-alive: a client can send many requests over one connection
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self.read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, content_type, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, content_type, payload = e.status, "application/json", {"error": str(e)}
+                except Exception as e:
+                    status, content_type, payload = 500, "application/json", {"error": str(e)}
+                self.write_response(writer, status, content_type, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def write_response(self, writer, status, content_type, payload, keep_alive):
+        if isinstance(payload, (dict, list)):
+            payload = json.dumps(payload, ensure_ascii=False)
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+            if "charset" not in content_type:
+                content_type += "; charset=utf-8"
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + payload)
+
+    async def serve(self, host=API_HOST, port=API_PORT, ready=None):
+        server = await asyncio.start_server(self.handle, host, port)
+        if ready:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP API for translation, transcription and speech output")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="pipeline calls running at once")
+    args = parser.parse_args(argv)
+
+    api = APIServer(workers=args.workers)
+    def ready(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"Serving on http://{host}:{port}", flush=True)
+    try:
+        asyncio.run(api.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import threading
+from concurrent.futures import Future
+
+from metrics import metrics
+
+# Request coalescing: concurrent calls with the same key share one in-flight result
+class SingleFlight:
+    def __init__(self, name=None):
+        # With a name, every call is counted in the metrics store as led or coalesced
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._flights[key] = future
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if self.name:
+            metrics.record_coalesce(self.name, not leader)
+        if not leader:
+            return future.result()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            # Waiters see the same failure; the next call after this one tries again
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            total = self.calls + self.coalesced
+            return {
+                "backend_calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+                "coalescing_ratio": self.coalesced / total if total else 0.0,
+            }
@@ -1,63 +1,85 @@
 import streamlit as st
 import speech_recognition as sr
-from deep_translator import GoogleTranslator
-from deep_translator.exceptions import NotValidPayload
-import sounddevice as sd
-from scipy.io.wavfile import write
 import os
 from dotenv import load_dotenv
-from gtts import gTTS
-import base64
+import asyncio
+import io
 import time
-import hashlib
-import sqlite3
-from datetime import datetime
-import PyDictionary
-from io import StringIO
+from documents import MAX_CHUNK_CHARS, ChunkTranslationError
+from language import MIN_CONFIDENCE, detect as detect_language, source_language
+from translation_memory import export_file, import_file
+from segments import SegmentStore, translate_incremental
+from nlp import extract_keywords, summarize
+from sentiment import analyze as analyze_sentiment
+from thesaurus import get_index as get_thesaurus_index
+from jobs import DONE, FAILED, QUEUED, RUNNING, JobManager
+from transport import CircuitOpenError, provider_stats, route_module
+from extract import SUPPORTED_EXTENSIONS, UnsupportedFileError, iter_paragraphs, preview
+from streaming_audio import LiveTranscriber
+from audio_io import audio_data_to_wav, audio_duration, join_audio, samples_to_audio_data
+from batch import translate_many
+from engine import (LANGUAGE_OPTIONS, TRANSLATION_MEMORY, TRANSLATION_WORKERS, get_speech_synthesizer,
+                    get_translation_cache, get_translation_flight, get_translation_memory, recognize,
+                    recognize_segment, speech_mime_type, synthesize, transcribe, translate_any, translate_paragraphs,
+                    translate_source, translate_with_memory)
+from metrics import instrument, metrics, start_metrics_server, timed
+from db import ConnectionPool, UserStore
+from styles import APP_CSS
+
+load_dotenv()
+
+# Multi-language batch settings (cache, memory and worker settings live in engine.py);
+# by default every language of a batch is requested at once
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", len(LANGUAGE_OPTIONS)))
+BATCH_TIMEOUT = float(os.getenv("BATCH_TIMEOUT", 20))
+
+# Speech output settings
+TTS_PRESYNTHESIS = os.getenv("TTS_PRESYNTHESIS", "1") == "1"
+TTS_STREAMING = os.getenv("TTS_STREAMING", "1") == "1"
+
+# Background jobs
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", 1.0))
+BACKGROUND_SUMMARY_CHARS = int(os.getenv("BACKGROUND_SUMMARY_CHARS", 50000))
+
+# Instrumentation: admins see the metrics tab, METRICS_PORT exposes /metrics for scrapers
+ADMIN_USERS = {u.strip() for u in os.getenv("ADMIN_USERS", "").split(",") if u.strip()}
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+
+# Authentication database
+AUTH_DB = os.getenv("AUTH_DB", "auth.db")
+AUTH_DB_POOL_SIZE = int(os.getenv("AUTH_DB_POOL_SIZE", 4))
+
+@st.cache_resource(show_spinner=False)
+def get_user_store():
+    return UserStore(ConnectionPool(AUTH_DB, size=AUTH_DB_POOL_SIZE))
 
 # Initialize database
 def init_db():
-    conn = sqlite3.connect('auth.db')
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS users
-                 (username TEXT PRIMARY KEY, 
-                  password TEXT,
-                  email TEXT,
-                  created_at TIMESTAMP)''')
-    conn.commit()
-    conn.close()
+    get_user_store()
 
 # User authentication functions
+@instrument("auth.create_user")
 def create_user(username, password, email):
-    conn = sqlite3.connect('auth.db')
-    c = conn.cursor()
-    hashed_pw = hashlib.sha256(password.encode()).hexdigest()
-    c.execute("INSERT INTO users VALUES (?, ?, ?, ?)",
-              (username, hashed_pw, email, datetime.now()))
-    conn.commit()
-    conn.close()
+    get_user_store().create_user(username, password, email)
 
+@instrument("auth.verify_user")
 def verify_user(username, password):
-    conn = sqlite3.connect('auth.db')
-    c = conn.cursor()
-    hashed_pw = hashlib.sha256(password.encode()).hexdigest()
-    c.execute("SELECT * FROM users WHERE username=? AND password=?", 
-              (username, hashed_pw))
-    result = c.fetchone()
-    conn.close()
-    return result is not None
+    return get_user_store().verify_user(username, password)
 
+@instrument("auth.user_exists")
 def user_exists(username):
-    conn = sqlite3.connect('auth.db')
-    c = conn.cursor()
-    c.execute("SELECT * FROM users WHERE username=?", (username,))
-    result = c.fetchone()
-    conn.close()
-    return result is not None
+    return get_user_store().user_exists(username)
 
 # Initialize database
 init_db()
 
+@st.cache_resource(show_spinner=False)
+def get_metrics_server():
+    return start_metrics_server(METRICS_PORT) if METRICS_PORT else None
+
+get_metrics_server()
+
 # Set page config
 st.set_page_config(
     page_title="Voice Translator Pro",
@@ -66,217 +88,17 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Main color scheme (Beige/Black theme)
-BEIGE = "#F5F5DC"
-DARK_BEIGE = "#E8E8D0"
-BLACK = "#121212"
-DARK_GRAY = "#1E1E1E"
-PRIMARY = "#4A6FA5"
-SECONDARY = "#6B8CBE"
-ACCENT = "#FF9F1C"
-
 # CSS for the entire app
-st.markdown(f"""
-<style>
-    /* Base styles */
-    :root {{
-        --background-color: {BEIGE};
-        --text-color: {BLACK};
-        --primary-color: {PRIMARY};
-        --secondary-color: {SECONDARY};
-        --accent-color: {ACCENT};
-        --card-bg: {DARK_BEIGE};
-        --hover-color: {DARK_GRAY};
-        --hover-text: white;
-    }}
-
-    /* Dark mode override */
-    @media (prefers-color-scheme: dark) {{
-        :root {{
-            --background-color: {DARK_GRAY};
-            --text-color: {BEIGE};
-            --card-bg: {BLACK};
-            --hover-color: {BEIGE};
-            --hover-text: {BLACK};
-        }}
-    }}
-
-    /* Global styles */
-    .stApp {{
-        background-color: var(--background-color) !important;
-        color: var(--text-color) !important;
-    }}
-    
-    /* Button styles */
-    .stButton>button {{
-        border: none;
-        border-radius: 8px;
-        padding: 10px 20px;
-        background-color: var(--primary-color);
-        color: white;
-        font-weight: bold;
-        transition: all 0.3s ease;
-    }}
-    
-    .stButton>button:hover {{
-        background-color: var(--accent-color);
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-        color: var(--hover-text);
-    }}
-    
-    /* Card styles */
-    .card {{
-        background-color: var(--card-bg);
-        border-radius: 15px;
-        padding: 25px;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        margin-bottom: 20px;
-        transition: all 0.3s ease;
-    }}
-    
-    .card:hover {{
-        transform: translateY(-5px);
-        box-shadow: 0 8px 15px rgba(0,0,0,0.2);
-    }}
-    
-    /* Input fields */
-    .stTextInput>div>div>input, 
-    .stTextArea>div>div>textarea {{
-        background-color: var(--card-bg);
-        color: var(--text-color);
-    }}
-    
-    /* Select boxes */
-    .stSelectbox>div>div {{
-        background-color: var(--card-bg);
-        color: var(--text-color);
-    }}
-    
-    /* File uploader */
-    .stFileUploader>div {{
-        border: 2px dashed var(--primary-color);
-        border-radius: 10px;
-        padding: 30px;
-        background-color: var(--card-bg);
-        transition: all 0.3s ease;
-    }}
-    
-    .stFileUploader>div:hover {{
-        border-color: var(--accent-color);
-        background-color: var(--hover-color);
-    }}
-    
-    /* Special elements */
-    .title-container {{
-        background: linear-gradient(135deg, {PRIMARY}, {ACCENT});
-        padding: 25px;
-        border-radius: 15px;
-        color: white;
-        text-align: center;
-        margin-bottom: 30px;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }}
-    
-    .indian-lang {{
-        font-size: 24px;
-        text-align: center;
-        margin: 20px 0;
-        padding: 20px;
-        background-color: var(--card-bg);
-        border-radius: 10px;
-        border-left: 5px solid var(--accent-color);
-    }}
-    
-    /* Auth pages */
-    .auth-container {{
-        max-width: 500px;
-        margin: 0 auto;
-        padding: 30px;
-        background-color: var(--card-bg);
-        border-radius: 15px;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }}
-    
-    .auth-title {{
-        text-align: center;
-        margin-bottom: 30px;
-        color: var(--primary-color);
-    }}
-    
-    /* Navbar */
-    .navbar {{
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        padding: 15px 0;
-        margin-bottom: 30px;
-        border-bottom: 1px solid var(--primary-color);
-    }}
-    
-    .nav-links {{
-        display: flex;
-        gap: 20px;
-    }}
-    
-    .nav-link {{
-        color: var(--primary-color);
-        text-decoration: none;
-        font-weight: bold;
-        transition: all 0.3s ease;
-    }}
-    
-    .nav-link:hover {{
-        color: var(--accent-color);
-    }}
-    
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] {{
-        gap: 10px;
-    }}
-    
-    .stTabs [data-baseweb="tab"] {{
-        padding: 10px 20px;
-        border-radius: 8px 8px 0 0;
-        transition: all 0.3s ease;
-    }}
-    
-    .stTabs [aria-selected="true"] {{
-        background-color: var(--primary-color);
-        color: white !important;
-    }}
-    
-    /* Text file preview */
-    .text-preview {{
-        max-height: 200px;
-        overflow-y: auto;
-        padding: 15px;
-        background-color: var(--card-bg);
-        border-radius: 8px;
-        margin-top: 10px;
-    }}
-</style>
-""", unsafe_allow_html=True)
-
-# Initialize recognizer
-recognizer = sr.Recognizer()
-
-# Initialize dictionary
-dictionary = PyDictionary.PyDictionary()
-
-# Language options
-LANGUAGE_OPTIONS = {
-    'en': 'English',
-    'hi': 'Hindi',
-    'kn': 'Kannada',
-    'mr': 'Marathi',
-    'ta': 'Tamil',
-    'te': 'Telugu',
-    'bn': 'Bengali',
-    'gu': 'Gujarati',
-    'ml': 'Malayalam',
-    'pa': 'Punjabi'
-}
+st.markdown(APP_CSS, unsafe_allow_html=True)
+
+# Shared resources, built once per process instead of on every rerun
+@st.cache_resource(show_spinner=False)
+def get_dictionary():
+    import PyDictionary
+    import PyDictionary.utils
+    route_module("PyDictionary.utils", "pydictionary")
+    return PyDictionary.PyDictionary()
+
 
 def get_default_language_index():
     return list(LANGUAGE_OPTIONS.keys()).index('en')
@@ -363,75 +185,136 @@ def forgot_password_page():
         st.rerun()
 
 # Text processing functions
+@instrument("extract_text")
 def extract_text_from_file(file):
-    if file.name.endswith('.txt'):
-        stringio = StringIO(file.getvalue().decode("utf-8"))
-        return stringio.read()
-    elif file.name.endswith('.docx'):
-        import docx
-        doc = docx.Document(file)
-        return "\n".join([para.text for para in doc.paragraphs])
-    else:
-        st.error("Unsupported file format")
+    try:
+        return "\n".join(iter_paragraphs(file))
+    except UnsupportedFileError as e:
+        st.error(str(e))
         return None
 
+# The latest input is either recognized/typed text or an uploaded file that is streamed on demand
+def set_original_text(text):
+    st.session_state.original_text = text
+    st.session_state.pop('original_file', None)
+
+def set_original_file(file):
+    st.session_state.original_file = file
+    st.session_state.pop('original_text', None)
+
+def has_original_input():
+    return 'original_text' in st.session_state or 'original_file' in st.session_state
+
+def get_original_text():
+    if 'original_file' in st.session_state:
+        return extract_text_from_file(st.session_state.original_file)
+    return st.session_state.original_text
+
 def get_synonyms_antonyms(word, language='en'):
+    # Local index first (see thesaurus.py); English words it does not know go to PyDictionary's web lookup
+    index = get_thesaurus_index(language)
+    if index is not None:
+        with timed("thesaurus.lookup"):
+            result = index.lookup(word)
+        if result is not None:
+            return {
+                "synonyms": result["synonyms"][:10],
+                "antonyms": result["antonyms"][:10]
+            }
+    if language != 'en':
+        return {"synonyms": [], "antonyms": []}
     try:
-        # For English only (PyDictionary limitation)
-        if language != 'en':
-            return {"synonyms": [], "antonyms": []}
-            
-        synonyms = dictionary.synonym(word) or []
-        antonyms = dictionary.antonym(word) or []
+        with timed("dictionary.lookup"):
+            dictionary = get_dictionary()
+            synonyms = dictionary.synonym(word) or []
+            antonyms = dictionary.antonym(word) or []
         return {
             "synonyms": list(set(synonyms))[:10],  # Limit to 10 synonyms
             "antonyms": list(set(antonyms))[:10]    # Limit to 10 antonyms
         }
-    except:
-        return {"synonyms": [], "antonyms": []}
+    except Exception as e:
+        return {"synonyms": [], "antonyms": [], "error": str(e)}
+
+def get_word_suggestions(prefix, language='en', limit=8):
+    index = get_thesaurus_index(language)
+    if index is None or not prefix:
+        return []
+    return index.complete(prefix, limit)
 
 # Main app functions
 def record_audio(duration=5, sample_rate=44100):
+    import sounddevice as sd
     with st.spinner(f"Recording for {duration} seconds... Speak now!"):
         recording = sd.rec(int(duration * sample_rate), 
                         samplerate=sample_rate, 
                         channels=1, 
                         dtype='int16')
         sd.wait()
-        write("temp_recording.wav", sample_rate, recording)
         st.toast("Recording complete!", icon="🎤")
-    return "temp_recording.wav"
+    return samples_to_audio_data(recording, sample_rate)
 
-def speech_to_text(audio_file, input_lang='en'):
+def speech_to_text(audio, input_lang='English'):
     try:
-        with sr.AudioFile(audio_file) as source:
-            audio_data = recognizer.record(source)
-            lang_map = {
-                'English': 'en-IN',
-                'Hindi': 'hi-IN',
-                'Kannada': 'kn-IN',
-                'Marathi': 'mr-IN',
-                'Tamil': 'ta-IN',
-                'Telugu': 'te-IN',
-                'Bengali': 'bn-IN',
-                'Gujarati': 'gu-IN',
-                'Malayalam': 'ml-IN',
-                'Punjabi': 'pa-IN'
-            }
-            language_code = lang_map.get(input_lang, 'en-IN')
-            text = recognizer.recognize_google(audio_data, language=language_code)
-            return text
+        return recognize(audio, input_lang)
     except sr.UnknownValueError:
         st.error("Could not understand audio")
         return None
-    except sr.RequestError as e:
+    except (sr.RequestError, CircuitOpenError) as e:
         st.error(f"Service error: {e}")
         return None
 
+def live_speech_to_text(input_lang, max_duration=30):
+    transcriber = LiveTranscriber(lambda samples, rate: recognize_segment(samples, rate, input_lang))
+    placeholder = st.empty()
+    parts = []
+    try:
+        with st.spinner(f"Listening for up to {max_duration} seconds... pause between sentences"):
+            for text in transcriber.listen(max_duration):
+                parts.append(text)
+                placeholder.markdown(f"<div style='background-color: var(--card-bg); padding: 15px; border-radius: 10px;'>{' '.join(parts)}</div>", unsafe_allow_html=True)
+    except (sr.RequestError, CircuitOpenError) as e:
+        st.error(f"Service error: {e}")
+    return " ".join(parts) or None
+
+def translate_changed_sentences(text, target_language):
+    # Sentences already translated in this session are reused; only edits are sent
+    if 'segment_store' not in st.session_state:
+        st.session_state.segment_store = SegmentStore()
+    try:
+        translation, stats = translate_incremental(
+            text, target_language,
+            lambda sentence: translate_any(sentence, target_language),
+            st.session_state.segment_store,
+            max_workers=TRANSLATION_WORKERS
+        )
+    except Exception as e:
+        st.error(f"Unexpected translation error: {e}")
+        return None
+    st.caption(f"Incremental: {stats['translated']} sentences translated, {stats['reused']} reused")
+    return translation
+
 def translate_text(text, target_language='en'):
+    from deep_translator.exceptions import NotValidPayload
     try:
-        translation = GoogleTranslator(source='auto', target=target_language).translate(text)
+        if isinstance(text, str):
+            if source_language(text) == target_language:
+                st.info(f"The text is already in {LANGUAGE_OPTIONS[target_language]}")
+                return text
+            if len(text) <= MAX_CHUNK_CHARS:
+                return translate_with_memory(text, target_language)
+        # Long text or an uploaded file: chunks are translated in parallel behind a progress bar
+        progress_bar = st.progress(0.0, text="Translating document...")
+        def update_progress(done, total):
+            progress_bar.progress(done / total, text=f"Translated {done}/{total} chunks")
+        translation = translate_source(text, target_language, progress=update_progress)
+        progress_bar.empty()
         return translation
+    except UnsupportedFileError as e:
+        st.error(str(e))
+        return None
+    except ChunkTranslationError as e:
+        st.error(f"Translation error: {e}")
+        return None
     except NotValidPayload as e:
         st.error(f"Translation error: {e}")
         return None
@@ -439,28 +322,209 @@ def translate_text(text, target_language='en'):
         st.error(f"Unexpected translation error: {e}")
         return None
 
+def translate_to_many(text, target_names):
+    # Each result card is drawn as soon as its language comes back
+    name_to_code = {name: code for code, name in LANGUAGE_OPTIONS.items()}
+
+    async def render():
+        start = time.perf_counter()
+        async for target_code, translation, error, seconds in translate_many(
+                text, [name_to_code[name] for name in target_names], translate_any,
+                concurrency=BATCH_CONCURRENCY, timeout=BATCH_TIMEOUT):
+            name = LANGUAGE_OPTIONS[target_code]
+            if error:
+                st.error(f"{name}: {error}")
+                continue
+            st.markdown(f"""
+            <div style='background-color: var(--primary-color); color: white; border-radius: 15px; padding: 20px; margin-bottom: 20px;'>
+                <h3>Translated to {name}</h3>
+                <p>{translation}</p>
+            </div>
+            """, unsafe_allow_html=True)
+            st.caption(f"{name} arrived after {seconds:.2f}s")
+        st.caption(f"All {len(target_names)} languages in {time.perf_counter() - start:.2f}s")
+
+    asyncio.run(render())
+
 def text_to_speech(text, language_code):
     try:
-        tts = gTTS(text=text, lang=language_code, slow=False)
-        audio_file = "translated_speech.mp3"
-        tts.save(audio_file)
-        return audio_file
+        return synthesize(text, language_code)
     except Exception as e:
         st.error(f"Text-to-speech error: {e}")
         return None
 
-def autoplay_audio(file_path):
-    with open(file_path, "rb") as f:
-        data = f.read()
-        b64 = base64.b64encode(data).decode()
-        md = f"""
-            <audio controls autoplay="true">
-            <source src="data:audio/mp3;base64,{b64}" type="audio/mp3">
-            </audio>
-            """
-        st.markdown(md, unsafe_allow_html=True)
+def play_speech(text, language_code):
+    # The first sentence chunk starts playing as soon as it is synthesized; the rest are
+    # synthesized meanwhile and the player is then swapped once for the whole text, resuming
+    # where the first chunk has got to. The script never waits on playback. st.audio hands the
+    # browser a media URL, so the audio is sent once and never inlined as base64.
+    mime_type = speech_mime_type()
+    placeholder = st.empty()
+    chunks = []
+    start = time.perf_counter()
+    try:
+        for audio in get_speech_synthesizer().stream(text, language_code):
+            if not audio:
+                continue
+            if not chunks:
+                metrics.observe("speech.first_audio", time.perf_counter() - start)
+                placeholder.audio(audio, format=mime_type, autoplay=True)
+                first_started = time.perf_counter()
+            chunks.append(audio)
+    except Exception as e:
+        st.error(f"Text-to-speech error: {e}")
+    if len(chunks) > 1:
+        full_audio = join_audio(chunks, mime_type)
+        played = min(time.perf_counter() - first_started, audio_duration(chunks[0], mime_type))
+        placeholder.audio(full_audio, format=mime_type, autoplay=True, start_time=round(played, 1))
+        extension = "wav" if mime_type == "audio/wav" else "mp3"
+        st.download_button("Download full audio", full_audio,
+                           file_name=f"speech_{language_code}.{extension}", mime=mime_type)
+
+def translation_memory_panel():
+    memory = get_translation_memory()
+    st.subheader("Translation memory")
+    st.json(memory.stats())
+    col1, col2 = st.columns(2)
+    with col1:
+        upload = st.file_uploader("Import memories", type=["tmx", "jsonl"], key="tm_import")
+        if upload and st.button("Import", key="tm_import_btn"):
+            try:
+                st.success(f"Imported {import_file(memory, upload, upload.name)} segments")
+            except Exception as e:
+                st.error(f"Import failed: {e}")
+    with col2:
+        export_format = st.radio("Export format", ["tmx", "jsonl"], horizontal=True, key="tm_export_format")
+        if st.button("Prepare export", key="tm_export_btn"):
+            out = io.StringIO()
+            export_file(memory, out, f"memory.{export_format}")
+            st.download_button("Download", out.getvalue(), file_name=f"translation_memory.{export_format}",
+                               mime="application/xml" if export_format == "tmx" else "application/jsonl")
+
+def metrics_panel():
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    st.header("Metrics")
+    st.dataframe(metrics.snapshot())
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Translation cache")
+        st.json(get_translation_cache().stats())
+        st.caption("Coalescing")
+        st.json(get_translation_flight().stats())
+    with col2:
+        st.subheader("Speech cache")
+        st.json(get_speech_synthesizer().cache.stats())
+        st.caption("Coalescing")
+        st.json(get_speech_synthesizer().flight.stats())
+    if TRANSLATION_MEMORY:
+        translation_memory_panel()
+    st.subheader("External providers")
+    st.dataframe(provider_stats())
+    export = metrics.to_prometheus()
+    st.download_button("Download Prometheus metrics", export, file_name="metrics.prom", mime="text/plain")
+    with st.expander("Prometheus text export"):
+        st.code(export, language="text")
+    if st.button("Reset metrics"):
+        metrics.reset()
+        st.rerun()
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# Background jobs: workers never touch st.*, the sidebar panel polls them
+@st.cache_resource(show_spinner=False)
+def get_job_manager():
+    return JobManager(max_workers=JOB_WORKERS)
+
+def submit_job(kind, name, fn, *args):
+    job = get_job_manager().submit(name, fn, *args, owner=st.session_state.username, kind=kind)
+    st.session_state.setdefault('job_ids', []).insert(0, job.id)
+    st.toast(f"Started: {name}", icon="⏳")
+    return job
+
+def translation_job(job, source, target_language):
+    paragraphs = source.split("\n") if isinstance(source, str) else iter_paragraphs(source)
+    return translate_paragraphs(
+        paragraphs, target_language, check=job.check_cancelled,
+        progress=lambda done, total: job.report(done, total, f"{done}/{total} chunks")
+    )
+
+def speech_batch_job(job, text, target_codes, synthesizer):
+    job.report(0, len(target_codes))
+    for i, target_code in enumerate(target_codes):
+        job.check_cancelled()
+        translation = translate_any(text, target_code)
+        job.emit((target_code, translation, synthesizer.synthesize(translation, target_code)))
+        job.report(i + 1, message=LANGUAGE_OPTIONS[target_code])
+
+def transcription_job(job, audio_file, input_lang):
+    return transcribe(
+        audio_file, input_lang, check=job.check_cancelled,
+        progress=lambda done, total: job.report(done, total, f"{done:.0f}/{total:.0f} s of audio")
+    )
+
+def summary_job(job, text):
+    return summarize(text, num_sentences=5)
+
+def show_job_result(job):
+    if job.kind == "speech":
+        mime_type = speech_mime_type()
+        for target_code, translation, audio in job.partial():
+            st.caption(LANGUAGE_OPTIONS[target_code])
+            st.audio(audio, format=mime_type)
+    elif job.status == DONE and job.result:
+        st.text_area("Result", job.result, height=150, key=f"job_result_{job.id}")
+        st.download_button("Download", job.result, file_name=f"{job.id}.txt", key=f"job_download_{job.id}")
+        if job.kind == "transcription" and st.button("Use for translation", key=f"job_use_{job.id}"):
+            set_original_text(job.result)
+            st.rerun()
+
+def session_jobs():
+    manager = get_job_manager()
+    return [job for job in map(manager.get, st.session_state.get('job_ids', [])) if job is not None]
+
+def has_active_jobs():
+    return any(job.status in (QUEUED, RUNNING) for job in session_jobs())
+
+def jobs_panel():
+    manager = get_job_manager()
+    jobs = session_jobs()
+    if not jobs:
+        st.caption("No background jobs")
+        return
+    for job in jobs:
+        with st.expander(f"{job.name} · {job.status}", expanded=not job.finished):
+            if job.status in (QUEUED, RUNNING):
+                st.progress(job.progress, text=job.message or job.status)
+                if st.button("Cancel", key=f"cancel_{job.id}"):
+                    manager.cancel(job.id)
+            elif job.status == FAILED:
+                st.error(job.error)
+            show_job_result(job)
+
+if hasattr(st, "fragment"):
+    # Only the panel reruns, and only while one of the session's jobs is in flight
+    idle_jobs_panel = st.fragment(jobs_panel)
+
+    @st.fragment(run_every=JOB_POLL_SECONDS)
+    def polling_jobs_panel():
+        jobs_panel()
+        if not has_active_jobs():
+            # The last job finished: one full rerun swaps in the idle panel
+            st.rerun()
+
+def show_jobs_panel():
+    st.subheader("⏳ Background Jobs")
+    if not hasattr(st, "fragment"):
+        jobs_panel()
+        st.button("Refresh", key="refresh_jobs")
+    elif has_active_jobs():
+        polling_jobs_panel()
+    else:
+        idle_jobs_panel()
 
 def main_app():
+    # Filled in last, so a job submitted during this run is already polled
+    jobs_slot = st.sidebar.container()
+    
     # Navigation bar
     st.markdown(f"""
     <div class="navbar">
@@ -481,17 +545,22 @@ def main_app():
     """, unsafe_allow_html=True)
     
     # Main tabs
-    tab1, tab2, tab3 = st.tabs(["Translation", "Text Processing", "Word Analysis"])
+    is_admin = st.session_state.username in ADMIN_USERS
+    tabs = st.tabs(["Translation", "Text Processing", "Word Analysis"] + (["Metrics"] if is_admin else []))
+    tab1, tab2, tab3 = tabs[:3]
     
     with tab1:
         # Language selection
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("<div class='card'>", unsafe_allow_html=True)
+            if 'detected_input_lang' in st.session_state:
+                # Set by an upload below; a widget's value can only change before it is drawn
+                st.session_state.input_lang = st.session_state.pop('detected_input_lang')
             input_lang = st.selectbox("Input Language", 
                                     ['English', 'Hindi', 'Kannada', 'Marathi', 
                                      'Tamil', 'Telugu', 'Bengali', 'Gujarati', 
-                                     'Malayalam', 'Punjabi'])
+                                     'Malayalam', 'Punjabi'], key="input_lang")
             st.markdown("</div>", unsafe_allow_html=True)
         
         with col2:
@@ -508,16 +577,31 @@ def main_app():
         
         with sub_tab1:
             st.markdown("<div class='card'>", unsafe_allow_html=True)
-            duration = st.slider("Recording duration (seconds)", 1, 10, 5)
-            if st.button("🎙️ Start Recording", key="record_btn"):
-                audio_file = record_audio(duration)
-                st.audio(audio_file)
-                text = speech_to_text(audio_file, input_lang)
+            capture_mode = st.radio("Capture mode", ["Fixed duration", "Live (split at pauses)", "Long recording (upload)"], horizontal=True)
+            if capture_mode == "Live (split at pauses)":
+                max_duration = st.slider("Maximum listening time (seconds)", 5, 120, 30)
+                if st.button("🎙️ Start Listening", key="live_record_btn"):
+                    st.subheader("Recognized Text")
+                    text = live_speech_to_text(input_lang, max_duration)
+                    if text:
+                        set_original_text(text)
+                    else:
+                        st.error("Could not understand audio")
+            if capture_mode == "Long recording (upload)":
+                audio_file = st.file_uploader("Upload a WAV or FLAC recording of any length", type=["wav", "flac"], key="long_audio_uploader")
+                if audio_file and st.button("📝 Transcribe in background", key="long_transcribe_btn"):
+                    # Own copy, so the worker doesn't depend on the uploader widget
+                    data = io.BytesIO(audio_file.getvalue())
+                    submit_job("transcription", f"Transcription of {audio_file.name}", transcription_job, data, input_lang)
+            duration = st.slider("Recording duration (seconds)", 1, 10, 5, disabled=capture_mode != "Fixed duration")
+            if capture_mode == "Fixed duration" and st.button("🎙️ Start Recording", key="record_btn"):
+                audio_data = record_audio(duration)
+                st.audio(audio_data_to_wav(audio_data), format="audio/wav")
+                text = speech_to_text(audio_data, input_lang)
                 if text:
                     st.subheader("Recognized Text")
                     st.markdown(f"<div style='background-color: var(--card-bg); padding: 15px; border-radius: 10px;'>{text}</div>", unsafe_allow_html=True)
-                    st.session_state.original_text = text
-                    os.remove(audio_file)
+                    set_original_text(text)
             st.markdown("</div>", unsafe_allow_html=True)
         
         with sub_tab2:
@@ -525,7 +609,7 @@ def main_app():
             text_input = st.text_area("Enter text to translate", height=150)
             if st.button("Translate Text", key="text_translate_btn"):
                 if text_input:
-                    st.session_state.original_text = text_input
+                    set_original_text(text_input)
                 else:
                     st.warning("Please enter some text to translate")
             st.markdown("</div>", unsafe_allow_html=True)
@@ -538,25 +622,70 @@ def main_app():
             </div>
             """, unsafe_allow_html=True)
             
-            text_file = st.file_uploader("Upload text file", type=["txt", "docx"], label_visibility="collapsed", key="text_file_uploader")
+            text_file = st.file_uploader("Upload text file", type=list(SUPPORTED_EXTENSIONS), label_visibility="collapsed", key="text_file_uploader")
             if text_file:
                 with st.spinner("Processing file..."):
-                    extracted_text = extract_text_from_file(text_file)
-                    if extracted_text:
+                    try:
+                        # Only the first part of the file is parsed for the preview
+                        preview_text, truncated = preview(iter_paragraphs(text_file))
+                    except UnsupportedFileError as e:
+                        st.error(str(e))
+                        preview_text = None
+                    if preview_text:
+                        code, confidence = detect_language(preview_text)
+                        file_id = getattr(text_file, "file_id", text_file.name)
+                        if code and st.session_state.get('detected_file_id') != file_id:
+                            st.session_state.detected_file_id = file_id
+                            if LANGUAGE_OPTIONS[code] != input_lang and confidence >= MIN_CONFIDENCE:
+                                st.session_state.detected_input_lang = LANGUAGE_OPTIONS[code]
+                                st.rerun()
+                        if code:
+                            st.caption(f"Detected language: {LANGUAGE_OPTIONS[code]} ({confidence:.0%})")
                         st.subheader("File Content Preview")
-                        st.markdown(f'<div class="text-preview">{extracted_text[:1000]}{"..." if len(extracted_text) > 1000 else ""}</div>', unsafe_allow_html=True)
-                        st.session_state.original_text = extracted_text
+                        st.markdown(f'<div class="text-preview">{preview_text}{"..." if truncated else ""}</div>', unsafe_allow_html=True)
+                        set_original_file(text_file)
             st.markdown("</div>", unsafe_allow_html=True)
         
         # Translation section
-        if 'original_text' in st.session_state:
+        if has_original_input():
             st.divider()
             st.markdown("<div class='card'>", unsafe_allow_html=True)
-            if st.button("🌍 Translate Text", key="translate_btn"):
+            is_large = 'original_file' in st.session_state or len(st.session_state.original_text) > MAX_CHUNK_CHARS
+            background = is_large and st.checkbox("Run in background", value=True, key="background_translate")
+            incremental = not background and 'original_text' in st.session_state and st.checkbox(
+                "Only re-translate changed sentences", value=True, key="incremental_translate")
+            translate_clicked = st.button("🌍 Translate Text", key="translate_btn")
+            if translate_clicked and background:
+                target_code = list(LANGUAGE_OPTIONS.keys())[list(LANGUAGE_OPTIONS.values()).index(target_language)]
+                source = st.session_state.get('original_file') or st.session_state.original_text
+                if not isinstance(source, str):
+                    # Own copy, so the worker doesn't share a file position with the preview
+                    data = io.BytesIO(source.getvalue())
+                    data.name = source.name
+                    source = data
+                submit_job("translation", f"Translation to {target_language}", translation_job, source, target_code)
+            elif translate_clicked:
                 target_code = list(LANGUAGE_OPTIONS.keys())[list(LANGUAGE_OPTIONS.values()).index(target_language)]
-                translated_text = translate_text(st.session_state.original_text, target_code)
+                if incremental:
+                    translated_text = translate_changed_sentences(st.session_state.original_text, target_code)
+                else:
+                    source = st.session_state.get('original_file') or st.session_state.original_text
+                    translated_text = translate_text(source, target_code)
+                stats = get_translation_cache().stats()
+                st.caption(f"Translation cache: {stats['hits']} hits / {stats['misses']} misses")
+                if TRANSLATION_MEMORY:
+                    tm_stats = get_translation_memory().stats()
+                    st.caption(f"Translation memory: {tm_stats['match_rate']:.0%} of {tm_stats['lookups']} sentences matched "
+                               f"({tm_stats['exact']} exact, {tm_stats['template']} template)")
                 
                 if translated_text:
+                    if TTS_PRESYNTHESIS:
+                        # Synthesis runs while the translation cards render
+                        synthesizer = get_speech_synthesizer()
+                        if TTS_STREAMING:
+                            synthesizer.presynthesize_chunks(translated_text, target_code)
+                        else:
+                            synthesizer.presynthesize(translated_text, target_code)
                     st.markdown(f"""
                     <div style='background-color: var(--primary-color); color: white; border-radius: 15px; padding: 20px; margin-bottom: 20px;'>
                         <h3>Translated to {target_language}</h3>
@@ -568,12 +697,32 @@ def main_app():
                         st.markdown(f"<div class='indian-lang'>{translated_text}</div>", unsafe_allow_html=True)
                     
                     st.subheader("🔊 Speech Output")
-                    audio_file = text_to_speech(translated_text, target_code)
-                    if audio_file:
-                        st.audio(audio_file)
-                        autoplay_audio(audio_file)
-                        if os.path.exists(audio_file):
-                            os.remove(audio_file)
+                    if TTS_STREAMING:
+                        play_speech(translated_text, target_code)
+                    else:
+                        audio_bytes = text_to_speech(translated_text, target_code)
+                        if audio_bytes:
+                            st.audio(audio_bytes, format=speech_mime_type(), autoplay=True)
+            
+            with st.expander("🌐 Translate to many languages"):
+                batch_targets = st.multiselect(
+                    "Target languages",
+                    list(LANGUAGE_OPTIONS.values()),
+                    default=[name for code, name in LANGUAGE_OPTIONS.items() if code != 'en']
+                )
+                col1, col2 = st.columns(2)
+                with col1:
+                    translate_all = st.button("Translate to All Selected", key="batch_translate_btn")
+                with col2:
+                    speak_all = st.button("🔊 Speech for All (background)", key="batch_speech_btn")
+                if (translate_all or speak_all) and not batch_targets:
+                    st.warning("Please select at least one language")
+                elif translate_all:
+                    translate_to_many(get_original_text(), batch_targets)
+                elif speak_all:
+                    name_to_code = {name: code for code, name in LANGUAGE_OPTIONS.items()}
+                    submit_job("speech", f"Speech in {len(batch_targets)} languages", speech_batch_job, get_original_text(),
+                               [name_to_code[name] for name in batch_targets], get_speech_synthesizer())
             st.markdown("</div>", unsafe_allow_html=True)
     
     with tab2:
@@ -586,26 +735,26 @@ def main_app():
         text_input = st.text_area("Enter text to process", height=200)
         
         if st.button("Process Text"):
-            if text_input:
+            if text_input and processing_option == "Text Summarization" and len(text_input) > BACKGROUND_SUMMARY_CHARS:
+                submit_job("summary", "Summary", summary_job, text_input)
+            elif text_input:
                 with st.spinner("Processing..."):
                     if processing_option == "Text Summarization":
-                        # Simple summarization (would replace with proper NLP in production)
-                        sentences = text_input.split('.')
-                        summary = '. '.join(sentences[:3]) + '.' if len(sentences) > 3 else text_input
+                        # Extractive summary: top TextRank sentences, in original order
+                        summary = summarize(text_input, num_sentences=3)
                         st.subheader("Summary")
                         st.write(summary)
                     elif processing_option == "Keyword Extraction":
-                        # Simple keyword extraction (would replace with proper NLP in production)
-                        words = [word for word in text_input.split() if len(word) > 5]
-                        keywords = list(set(words))[:10]  # Get first 10 unique longer words
+                        # Terms ranked by total TF-IDF weight across sentences
+                        keywords = extract_keywords(text_input, top_k=10)
                         st.subheader("Keywords")
                         st.write(", ".join(keywords))
                     elif processing_option == "Sentiment Analysis":
-                        # Simple sentiment (would replace with proper NLP in production)
-                        positive_words = ["good", "great", "excellent", "happy"]
-                        sentiment = "positive" if any(word in text_input.lower() for word in positive_words) else "neutral/negative"
+                        # Lexicon scores per word, with negation flipping nearby words
+                        sentiment = analyze_sentiment(text_input)
                         st.subheader("Sentiment")
-                        st.write(sentiment)
+                        st.write(sentiment["label"])
+                        st.caption(f"Score {sentiment['compound']:+.2f} · {sentiment['positive']} positive / {sentiment['negative']} negative words")
             else:
                 st.warning("Please enter some text to process")
         st.markdown("</div>", unsafe_allow_html=True)
@@ -621,6 +770,9 @@ def main_app():
                                    ['English', 'Hindi', 'Kannada', 'Marathi', 
                                     'Tamil', 'Telugu', 'Bengali', 'Gujarati', 
                                     'Malayalam', 'Punjabi'])
+            suggestions = get_word_suggestions(word, list(LANGUAGE_OPTIONS.keys())[list(LANGUAGE_OPTIONS.values()).index(language)])
+            if suggestions and suggestions != [word.strip().lower()]:
+                st.caption("Suggestions: " + ", ".join(suggestions))
         
         if st.button("Analyze Word"):
             if word:
@@ -650,11 +802,20 @@ def main_app():
                     </div>
                     """, unsafe_allow_html=True)
                 
-                if not results["synonyms"] and not results["antonyms"]:
+                if results.get("error"):
+                    st.warning(f"Dictionary lookup failed: {results['error']}")
+                elif not results["synonyms"] and not results["antonyms"]:
                     st.warning("No synonyms/antonyms found or language not supported (currently only English fully supported)")
             else:
                 st.warning("Please enter a word to analyze")
         st.markdown("</div>", unsafe_allow_html=True)
+    
+    if is_admin:
+        with tabs[3]:
+            metrics_panel()
+
+    with jobs_slot:
+        show_jobs_panel()
 
 # Main app flow
 if 'logged_in' not in st.session_state:
@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Fixed-size ring buffer filled from the audio callback
+class RingBuffer:
+    def __init__(self, capacity, dtype=np.int16):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._write_pos = 0
+        self._read_pos = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def write(self, samples):
+        samples = np.asarray(samples, dtype=self._data.dtype).reshape(-1)
+        with self._lock:
+            if len(samples) > self.capacity:
+                samples = samples[-self.capacity:]
+            start = self._write_pos % self.capacity
+            end = start + len(samples)
+            if end <= self.capacity:
+                self._data[start:end] = samples
+            else:
+                split = self.capacity - start
+                self._data[start:] = samples[:split]
+                self._data[:end - self.capacity] = samples[split:]
+            self._write_pos += len(samples)
+            # Reader fell behind by more than a full buffer: skip what was overwritten
+            if self._write_pos - self._read_pos > self.capacity:
+                self.dropped += self._write_pos - self._read_pos - self.capacity
+                self._read_pos = self._write_pos - self.capacity
+
+    def read(self):
+        with self._lock:
+            available = self._write_pos - self._read_pos
+            if available == 0:
+                return self._data[:0].copy()
+            start = self._read_pos % self.capacity
+            end = start + available
+            if end <= self.capacity:
+                out = self._data[start:end].copy()
+            else:
+                out = np.concatenate((self._data[start:], self._data[:end - self.capacity]))
+            self._read_pos = self._write_pos
+            return out
+
+# Energy-based voice activity segmentation
+class UtteranceSegmenter:
+    def __init__(self, sample_rate, frame_ms=30, threshold=500.0, noise_ratio=3.0, max_level_ratio=4.0,
+                 min_speech_ms=250, max_silence_ms=600, pre_roll_ms=200, max_utterance_s=15):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.threshold = threshold
+        self.noise_ratio = noise_ratio
+        # The speech level never rises above threshold * max_level_ratio, however noisy the room
+        self.max_level = threshold * max_level_ratio
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.max_silence_frames = max(1, max_silence_ms // frame_ms)
+        self.max_utterance_frames = int(max_utterance_s * 1000 / frame_ms)
+        # Seeded from the threshold, not the first frame: the user may already be talking
+        self.noise_floor = threshold / noise_ratio
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._pre_roll = deque(maxlen=max(1, pre_roll_ms // frame_ms))
+        self._frames = []
+        self._speech_frames = 0
+        self._silence_frames = 0
+
+    def _is_speech(self, frame):
+        rms = float(np.sqrt(np.mean(frame.astype(np.float32) ** 2)))
+        level = min(self.max_level, max(self.threshold, self.noise_floor * self.noise_ratio))
+        if rms < level:
+            # Track background noise only while nobody is talking
+            self.noise_floor = min(self.max_level / self.noise_ratio, 0.95 * self.noise_floor + 0.05 * rms)
+            return False
+        return True
+
+    def feed(self, samples):
+        # Returns the utterances completed by this block of samples
+        utterances = []
+        data = np.concatenate((self._pending, np.asarray(samples, dtype=np.int16).reshape(-1)))
+        n_frames = len(data) // self.frame_len
+        self._pending = data[n_frames * self.frame_len:]
+        for i in range(n_frames):
+            frame = data[i * self.frame_len:(i + 1) * self.frame_len]
+            speech = self._is_speech(frame)
+            if not self._frames:
+                if speech:
+                    self._frames = list(self._pre_roll) + [frame]
+                    self._speech_frames = 1
+                    self._silence_frames = 0
+                else:
+                    self._pre_roll.append(frame)
+                continue
+            self._frames.append(frame)
+            if speech:
+                self._speech_frames += 1
+                self._silence_frames = 0
+            else:
+                self._silence_frames += 1
+            if (self._silence_frames >= self.max_silence_frames
+                    or len(self._frames) >= self.max_utterance_frames):
+                utterance = self._close()
+                if utterance is not None:
+                    utterances.append(utterance)
+        return utterances
+
+    def flush(self):
+        return self._close() if self._frames else None
+
+    def _close(self):
+        frames, speech = self._frames, self._speech_frames
+        self._frames = []
+        self._speech_frames = 0
+        self._silence_frames = 0
+        self._pre_roll.clear()
+        if speech < self.min_speech_frames:
+            return None
+        return np.concatenate(frames)
+
+# Microphone stream -> segments -> recognition, all while the user keeps talking
+class LiveTranscriber:
+    def __init__(self, recognize_fn, sample_rate=16000, block_ms=100, buffer_s=30,
+                 max_workers=2, **segmenter_options):
+        self.recognize_fn = recognize_fn
+        self.sample_rate = sample_rate
+        self.blocksize = int(sample_rate * block_ms / 1000)
+        self.buffer = RingBuffer(sample_rate * buffer_s)
+        self.segmenter = UtteranceSegmenter(sample_rate, **segmenter_options)
+        self.max_workers = max_workers
+
+    def _callback(self, indata, frames, time_info, status):
+        self.buffer.write(indata[:, 0])
+
+    def listen(self, max_duration=30, stop_event=None):
+        # Yields recognized text for each utterance, in speaking order
+        import sounddevice as sd
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = deque()
+        deadline = time.time() + max_duration
+        stream = sd.InputStream(samplerate=self.sample_rate, channels=1, dtype='int16',
+                                blocksize=self.blocksize, callback=self._callback)
+        try:
+            with stream:
+                while time.time() < deadline and not (stop_event and stop_event.is_set()):
+                    time.sleep(self.blocksize / self.sample_rate)
+                    for utterance in self.segmenter.feed(self.buffer.read()):
+                        futures.append(executor.submit(self.recognize_fn, utterance, self.sample_rate))
+                    while futures and futures[0].done():
+                        text = futures.popleft().result()
+                        if text:
+                            yield text
+            remaining = self.segmenter.feed(self.buffer.read())
+            last = self.segmenter.flush()
+            if last is not None:
+                remaining.append(last)
+            for utterance in remaining:
+                futures.append(executor.submit(self.recognize_fn, utterance, self.sample_rate))
+            while futures:
+                text = futures.popleft().result()
+                if text:
+                    yield text
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,191 @@
+# Main color scheme (Beige/Black theme)
+BEIGE = "#F5F5DC"
+DARK_BEIGE = "#E8E8D0"
+BLACK = "#121212"
+DARK_GRAY = "#1E1E1E"
+PRIMARY = "#4A6FA5"
+SECONDARY = "#6B8CBE"
+ACCENT = "#FF9F1C"
+
+# CSS for the entire app, built once per process
+APP_CSS = f"""
+<style>
+    /* Base styles */
+    :root {{
+        --background-color: {BEIGE};
+        --text-color: {BLACK};
+        --primary-color: {PRIMARY};
+        --secondary-color: {SECONDARY};
+        --accent-color: {ACCENT};
+        --card-bg: {DARK_BEIGE};
+        --hover-color: {DARK_GRAY};
+        --hover-text: white;
+    }}
+
+    /* Dark mode override */
+    @media (prefers-color-scheme: dark) {{
+        :root {{
+            --background-color: {DARK_GRAY};
+            --text-color: {BEIGE};
+            --card-bg: {BLACK};
+            --hover-color: {BEIGE};
+            --hover-text: {BLACK};
+        }}
+    }}
+
+    /* Global styles */
+    .stApp {{
+        background-color: var(--background-color) !important;
+        color: var(--text-color) !important;
+    }}
+    
+    /* Button styles */
+    .stButton>button {{
+        border: none;
+        border-radius: 8px;
+        padding: 10px 20px;
+        background-color: var(--primary-color);
+        color: white;
+        font-weight: bold;
+        transition: all 0.3s ease;
+    }}
+    
+    .stButton>button:hover {{
+        background-color: var(--accent-color);
+        transform: translateY(-2px);
+        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+        color: var(--hover-text);
+    }}
+    
+    /* Card styles */
+    .card {{
+        background-color: var(--card-bg);
+        border-radius: 15px;
+        padding: 25px;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        margin-bottom: 20px;
+        transition: all 0.3s ease;
+    }}
+    
+    .card:hover {{
+        transform: translateY(-5px);
+        box-shadow: 0 8px 15px rgba(0,0,0,0.2);
+    }}
+    
+    /* Input fields */
+    .stTextInput>div>div>input, 
+    .stTextArea>div>div>textarea {{
+        background-color: var(--card-bg);
+        color: var(--text-color);
+    }}
+    
+    /* Select boxes */
+    .stSelectbox>div>div {{
+        background-color: var(--card-bg);
+        color: var(--text-color);
+    }}
+    
+    /* File uploader */
+    .stFileUploader>div {{
+        border: 2px dashed var(--primary-color);
+        border-radius: 10px;
+        padding: 30px;
+        background-color: var(--card-bg);
+        transition: all 0.3s ease;
+    }}
+    
+    .stFileUploader>div:hover {{
+        border-color: var(--accent-color);
+        background-color: var(--hover-color);
+    }}
+    
+    /* Special elements */
+    .title-container {{
+        background: linear-gradient(135deg, {PRIMARY}, {ACCENT});
+        padding: 25px;
+        border-radius: 15px;
+        color: white;
+        text-align: center;
+        margin-bottom: 30px;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    }}
+    
+    .indian-lang {{
+        font-size: 24px;
+        text-align: center;
+        margin: 20px 0;
+        padding: 20px;
+        background-color: var(--card-bg);
+        border-radius: 10px;
+        border-left: 5px solid var(--accent-color);
+    }}
+    
+    /* Auth pages */
+    .auth-container {{
+        max-width: 500px;
+        margin: 0 auto;
+        padding: 30px;
+        background-color: var(--card-bg);
+        border-radius: 15px;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    }}
+    
+    .auth-title {{
+        text-align: center;
+        margin-bottom: 30px;
+        color: var(--primary-color);
+    }}
+    
+    /* Navbar */
+    .navbar {{
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        padding: 15px 0;
+        margin-bottom: 30px;
+        border-bottom: 1px solid var(--primary-color);
+    }}
+    
+    .nav-links {{
+        display: flex;
+        gap: 20px;
+    }}
+    
+    .nav-link {{
+        color: var(--primary-color);
+        text-decoration: none;
+        font-weight: bold;
+        transition: all 0.3s ease;
+    }}
+    
+    .nav-link:hover {{
+        color: var(--accent-color);
+    }}
+    
+    /* Tabs */
+    .stTabs [data-baseweb="tab-list"] {{
+        gap: 10px;
+    }}
+    
+    .stTabs [data-baseweb="tab"] {{
+        padding: 10px 20px;
+        border-radius: 8px 8px 0 0;
+        transition: all 0.3s ease;
+    }}
+    
+    .stTabs [aria-selected="true"] {{
+        background-color: var(--primary-color);
+        color: white !important;
+    }}
+    
+    /* Text file preview */
+    .text-preview {{
+        max-height: 200px;
+        overflow-y: auto;
+        padding: 15px;
+        background-color: var(--card-bg);
+        border-radius: 8px;
+        margin-top: 10px;
+    }}
+</style>
+"""
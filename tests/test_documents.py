@@ -0,0 +1,20 @@
+import pytest
+
+from documents import ChunkTranslationError, _translate_with_retry, translate_chunks
+
+@pytest.mark.parametrize("result", [None, "", "   "])
+def test_blank_result_raises(result):
+    with pytest.raises(ChunkTranslationError) as error:
+        _translate_with_retry(3, "Some text.", lambda chunk: result, retries=0, backoff=0)
+    assert error.value.index == 3
+
+def test_blank_chunk_passes_through_untranslated():
+    assert _translate_with_retry(0, "  ", lambda chunk: None, retries=0, backoff=0) == "  "
+
+def test_blank_result_is_retried():
+    results = iter(["", "translated"])
+    assert _translate_with_retry(0, "Some text.", lambda chunk: next(results), retries=1, backoff=0) == "translated"
+
+def test_chunks_keep_their_separators():
+    chunks = [("one", "\n"), ("", "\n"), ("two", "")]
+    assert translate_chunks(chunks, str.upper) == "ONE\n\nTWO"
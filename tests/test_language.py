@@ -0,0 +1,11 @@
+from language import MIN_CONFIDENCE, detect
+
+def test_hinglish_is_not_confident_english():
+    language, confidence = detect("hi kaise ho")
+    assert confidence < MIN_CONFIDENCE
+
+def test_plain_english_is_confident():
+    assert detect("Hello, how are you doing today?") == ("en", 1.0)
+
+def test_devanagari_is_hindi():
+    assert detect("आप कैसे हैं?")[0] == "hi"
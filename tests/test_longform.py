@@ -0,0 +1,44 @@
+import io
+import wave
+
+import numpy as np
+import pytest
+import speech_recognition as sr
+
+from longform import silence_threshold, transcribe_long
+
+RATE = 16000
+
+def wav_bytes(samples, rate=RATE):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.asarray(samples, dtype=np.int16).tobytes())
+    return buffer.getvalue()
+
+def quiet_recording(seconds=40, amplitude=300):
+    # Speech-like bursts well below the old fixed 500 RMS silence level, with pauses between them
+    t = np.arange(RATE) / RATE
+    burst = amplitude * np.sin(2 * np.pi * 200 * t)
+    pause = np.random.default_rng(0).normal(0, 5, RATE)
+    return np.concatenate([burst if i % 2 == 0 else pause for i in range(seconds)])
+
+def test_threshold_follows_a_quiet_recording():
+    with sr.AudioFile(io.BytesIO(wav_bytes(quiet_recording()))) as audio_file:
+        threshold = silence_threshold(audio_file)
+    # Between the pauses and the bursts (RMS about 212)
+    assert 5 < threshold < 212
+
+def test_quiet_recording_is_transcribed():
+    windows = []
+    def recognize(samples, rate):
+        windows.append(len(samples))
+        return "words"
+    text = transcribe_long(wav_bytes(quiet_recording()), recognize, window_s=10)
+    assert windows and text.startswith("words")
+
+def test_nothing_recognized_raises():
+    with pytest.raises(sr.UnknownValueError):
+        transcribe_long(wav_bytes(quiet_recording(seconds=12)), lambda samples, rate: None, window_s=10)
@@ -0,0 +1,27 @@
+import numpy as np
+
+from preprocess import TARGET_RATE, preprocess, trim_silence
+
+RATE = 44100
+
+def tone(seconds, amplitude, rate=RATE):
+    t = np.arange(int(seconds * rate)) / rate
+    return amplitude * np.sin(2 * np.pi * 220 * t)
+
+def test_silence_and_hiss_come_back_empty():
+    hiss = np.random.default_rng(0).normal(0, 40, 2 * RATE).astype(np.int16)
+    assert len(preprocess(hiss, RATE)[0]) == 0
+    assert len(preprocess(np.zeros(RATE, dtype=np.int16), RATE)[0]) == 0
+
+def test_quiet_clean_speech_is_kept_and_trimmed():
+    clip = np.concatenate([np.zeros(RATE), tone(1.0, 1500), np.zeros(RATE)]).astype(np.int16)
+    processed, rate = preprocess(clip, RATE)
+    assert rate == TARGET_RATE
+    # One second of tone plus 150 ms of padding on each side
+    assert abs(len(processed) / rate - 1.3) < 0.05
+    assert np.abs(processed).max() > 10000
+
+def test_trim_silence_leaves_a_clip_without_loud_frames_alone():
+    quiet = tone(0.5, 200)
+    assert len(trim_silence(quiet, RATE)) == len(quiet)
+    assert len(trim_silence(np.zeros(RATE), RATE)) == RATE
@@ -0,0 +1,21 @@
+import pytest
+
+from documents import ChunkTranslationError
+from segments import SegmentStore, translate_incremental
+
+def test_only_new_sentences_are_sent_in_one_run():
+    store = SegmentStore()
+    calls = []
+    def translate(text):
+        calls.append(text)
+        return text.upper()
+    translate_incremental("One. Two.", "hi", translate, store)
+    text, stats = translate_incremental("One. Two. Three. Four.", "hi", translate, store)
+    assert text == "ONE. TWO. THREE. FOUR."
+    assert calls == ["One. Two.", "Three. Four."]
+    assert stats == {"segments": 4, "translated": 2, "reused": 2}
+
+@pytest.mark.parametrize("result", [None, "", "  "])
+def test_empty_run_translation_raises(result):
+    with pytest.raises(ChunkTranslationError):
+        translate_incremental("One. Two.", "hi", lambda text: result, SegmentStore())
@@ -0,0 +1,35 @@
+import pytest
+
+from documents import ChunkTranslationError
+from translation_memory import TranslationMemory, translate_segments
+
+FORM = "All applicants must submit the signed registration form before the deadline on Friday."
+
+def make_memory(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "tm.db"))
+    memory.add(FORM, "TRANSLATION-A", "en", "hi")
+    memory.add("Is the office open today?", "TRANSLATION-Q", "en", "hi")
+    memory.add("Room 12 opens at 9.", "Kamra 12 9 baje khulta hai.", "en", "hi")
+    return memory
+
+def test_inserted_negation_is_a_miss(tmp_path):
+    memory = make_memory(tmp_path)
+    negated = FORM.replace("must submit", "must not submit")
+    assert memory.lookup(negated, "en", "hi") is None
+    assert memory.stats()["miss"] == 1
+
+def test_changed_punctuation_is_a_miss(tmp_path):
+    memory = make_memory(tmp_path)
+    assert memory.lookup("Is the office open today.", "en", "hi") is None
+
+def test_numbers_spacing_and_case_still_match(tmp_path):
+    memory = make_memory(tmp_path)
+    assert memory.lookup("room 14  opens at 10.", "en", "hi") == ("Kamra 14 10 baje khulta hai.", "template")
+    assert memory.lookup(FORM.upper(), "en", "hi")[0] == "TRANSLATION-A"
+
+def test_empty_run_translation_raises(tmp_path):
+    memory = make_memory(tmp_path)
+    with pytest.raises(ChunkTranslationError):
+        translate_segments("Is the office open today? Something new.", lambda run: None, memory, "en", "hi")
+    with pytest.raises(ChunkTranslationError):
+        translate_segments("Something new.", lambda run: "  ", memory, "en", "hi")
@@ -0,0 +1,36 @@
+import time
+
+from transport import CircuitBreaker
+
+def open_breaker(reset_timeout=0.05):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=reset_timeout)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+def test_half_open_admits_exactly_one_probe():
+    breaker = open_breaker()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+    assert [breaker.allow() for _ in range(5)] == [True, False, False, False, False]
+
+def test_probe_success_closes_and_failure_reopens():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+def test_unanswered_probe_expires():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
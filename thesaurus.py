@@ -0,0 +1,226 @@
+import argparse
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import unicodedata
+
+# Offline thesaurus: one memory-mapped index file per language
+#
+# Layout: MAGIC | count (uint64) | count offsets (uint64, sorted by key) | records
+# Each record is "key\tsyn1,syn2\tant1,ant2\n" in UTF-8.
+
+MAGIC = b"VTTHES01"
+HEADER = struct.Struct("<8sQ")
+OFFSET = struct.Struct("<Q")
+
+THESAURUS_DIR = os.getenv("THESAURUS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "thesaurus"))
+
+def normalize_word(word):
+    return unicodedata.normalize("NFC", word.strip().lower())
+
+# Building
+def read_dump(path):
+    # Lines of "word<TAB>synonyms<TAB>antonyms", lists comma-separated; repeated words are merged
+    entries = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t") + ["", ""]
+            word = normalize_word(fields[0])
+            synonyms, antonyms = entries.setdefault(word, ({}, {}))
+            for target, field in ((synonyms, fields[1]), (antonyms, fields[2])):
+                for item in field.split(","):
+                    item = item.strip()
+                    if item and normalize_word(item) != word:
+                        target.setdefault(item, None)
+    return entries
+
+# WordNet database files (data.noun, data.verb, data.adj, data.adv), as in the WordNet 3.0
+# distribution or nltk_data/corpora/wordnet
+WORDNET_FILES = ("data.noun", "data.verb", "data.adj", "data.adv")
+WORDNET_POS = {"n": "data.noun", "v": "data.verb", "a": "data.adj", "s": "data.adj", "r": "data.adv"}
+ADJECTIVE_MARKER = re.compile(r"\([a-z]+\)$")
+
+def _wordnet_synsets(directory):
+    # {(file, offset): (words, antonym pointers)}; antonyms are (source word, file, offset, target word)
+    synsets = {}
+    for name in WORDNET_FILES:
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("  "):
+                    continue  # licence header
+                fields = line.split(" | ")[0].split()
+                n_words = int(fields[3], 16)
+                words = [ADJECTIVE_MARKER.sub("", w).replace("_", " ") for w in fields[4:4 + 2 * n_words:2]]
+                i = 4 + 2 * n_words
+                pointers = []
+                for _ in range(int(fields[i])):
+                    symbol, offset, pos, source_target = fields[i + 1:i + 5]
+                    if symbol == "!":
+                        pointers.append((int(source_target[:2], 16), WORDNET_POS[pos], offset,
+                                         int(source_target[2:], 16)))
+                    i += 4
+                synsets[(name, fields[0])] = (words, pointers)
+    return synsets
+
+def read_wordnet(directory):
+    # Same shape as read_dump: synonyms are the other words of each synset, antonyms come from
+    # WordNet's lexical antonym pointers
+    synsets = _wordnet_synsets(directory)
+    entries = {}
+    for words, pointers in synsets.values():
+        for position, word in enumerate(words, 1):
+            key = normalize_word(word)
+            synonyms, antonyms = entries.setdefault(key, ({}, {}))
+            for other in words:
+                if normalize_word(other) != key:
+                    synonyms.setdefault(other, None)
+            for source, name, offset, target in pointers:
+                if source in (0, position) and (name, offset) in synsets:
+                    targets = synsets[(name, offset)][0]
+                    for antonym in (targets if target == 0 else targets[target - 1:target]):
+                        antonyms.setdefault(antonym, None)
+    return entries
+
+def build_index(entries, output_path):
+    keys = sorted(entries, key=lambda k: k.encode("utf-8"))
+    records = []
+    for key in keys:
+        synonyms, antonyms = entries[key]
+        record = f"{key}\t{','.join(synonyms)}\t{','.join(antonyms)}\n"
+        records.append(record.encode("utf-8"))
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    # Written aside and moved into place, so a running app never maps a half-written index
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(records)))
+        offset = HEADER.size + OFFSET.size * len(records)
+        for record in records:
+            f.write(OFFSET.pack(offset))
+            offset += len(record)
+        for record in records:
+            f.write(record)
+    os.replace(tmp_path, output_path)
+    return len(records)
+
+# Lookup
+class ThesaurusIndex:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a thesaurus index")
+
+    def _record_start(self, i):
+        return OFFSET.unpack_from(self._map, HEADER.size + OFFSET.size * i)[0]
+
+    def _key(self, i):
+        start = self._record_start(i)
+        return self._map[start:self._map.find(b"\t", start)]
+
+    def _record(self, i):
+        start = self._record_start(i)
+        line = self._map[start:self._map.find(b"\n", start)].decode("utf-8")
+        key, synonyms, antonyms = line.split("\t")
+        return key, [s for s in synonyms.split(",") if s], [a for a in antonyms.split(",") if a]
+
+    def _lower_bound(self, key):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def lookup(self, word):
+        key = normalize_word(word).encode("utf-8")
+        i = self._lower_bound(key)
+        if i < self.count and self._key(i) == key:
+            _, synonyms, antonyms = self._record(i)
+            return {"synonyms": synonyms, "antonyms": antonyms}
+        return None
+
+    def complete(self, prefix, limit=10):
+        key = normalize_word(prefix).encode("utf-8")
+        i = self._lower_bound(key)
+        words = []
+        while i < self.count and len(words) < limit:
+            candidate = self._key(i)
+            if not candidate.startswith(key):
+                break
+            words.append(candidate.decode("utf-8"))
+            i += 1
+        return words
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_index(language, directory=None):
+    # None when there is no index for this language. A bundled <lang>.tsv dump is built into
+    # <lang>.idx on first use; misses are not cached, so an index built later is picked up.
+    directory = directory or THESAURUS_DIR
+    path = os.path.join(directory, f"{language}.idx")
+    with _indexes_lock:
+        if path not in _indexes:
+            dump = os.path.join(directory, f"{language}.tsv")
+            if not os.path.exists(path) and os.path.exists(dump):
+                build_index(read_dump(dump), path)
+            if not os.path.exists(path):
+                return None
+            _indexes[path] = ThesaurusIndex(path)
+        return _indexes[path]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query offline thesaurus indexes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="build an index from a word<TAB>synonyms<TAB>antonyms dump")
+    build.add_argument("dump")
+    build.add_argument("language", help="language code, e.g. en or hi")
+    build.add_argument("--dir", default=THESAURUS_DIR)
+    wordnet = subparsers.add_parser("wordnet", help="build the English index from a WordNet dict directory")
+    wordnet.add_argument("dict_dir", help="directory holding data.noun, data.verb, data.adj and data.adv")
+    wordnet.add_argument("--language", default="en")
+    wordnet.add_argument("--dir", default=THESAURUS_DIR)
+    query = subparsers.add_parser("lookup", help="look a word up")
+    query.add_argument("language")
+    query.add_argument("word")
+    query.add_argument("--dir", default=THESAURUS_DIR)
+    complete = subparsers.add_parser("complete", help="list words starting with a prefix")
+    complete.add_argument("language")
+    complete.add_argument("prefix")
+    complete.add_argument("--dir", default=THESAURUS_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command in ("build", "wordnet"):
+        output = os.path.join(args.dir, f"{args.language}.idx")
+        entries = read_dump(args.dump) if args.command == "build" else read_wordnet(args.dict_dir)
+        count = build_index(entries, output)
+        print(f"Indexed {count} words into {output}")
+        return 0
+    index = get_index(args.language, args.dir)
+    if index is None:
+        print(f"No index for '{args.language}' in {args.dir}", file=sys.stderr)
+        return 1
+    if args.command == "lookup":
+        print(index.lookup(args.word))
+    else:
+        print("\n".join(index.complete(args.prefix)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
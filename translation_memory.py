@@ -0,0 +1,299 @@
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import escape, quoteattr
+
+from cache import normalize_text
+from db import ConnectionPool
+from documents import MAX_CHUNK_CHARS, ChunkTranslationError
+from segments import segment
+
+# Translation memory: source/target segment pairs per language pair, matched exactly or as
+# number-only template variants. A template is only served when the texts differ in numbers,
+# whitespace or case: a sentence that adds a "not" or turns a statement into a question goes
+# to the backend.
+
+NUMBER = re.compile(r"\d+(?:[.,:/-]\d+)*")
+PUNCTUATION = re.compile(r"[^\w\s#]+")
+TOKEN = re.compile(r"\w+|[^\w\s]")
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+CREATE_SEGMENTS = '''CREATE TABLE IF NOT EXISTS tm_segments
+                     (id INTEGER PRIMARY KEY,
+                      source_lang TEXT,
+                      target_lang TEXT,
+                      source TEXT,
+                      target TEXT,
+                      source_norm TEXT,
+                      source_mask TEXT,
+                      created_at REAL,
+                      uses INTEGER DEFAULT 0,
+                      UNIQUE (source_lang, target_lang, source_norm))'''
+CREATE_MASK_INDEX = "CREATE INDEX IF NOT EXISTS tm_segments_mask ON tm_segments (source_lang, target_lang, source_mask)"
+SELECT_EXACT = "SELECT id, target FROM tm_segments WHERE source_lang=? AND target_lang=? AND source_norm=?"
+SELECT_MASK = "SELECT id, source, target FROM tm_segments WHERE source_lang=? AND target_lang=? AND source_mask=? LIMIT 5"
+SELECT_ID = "SELECT id FROM tm_segments WHERE source_lang=? AND target_lang=? AND source_norm=?"
+INSERT_SEGMENT = '''INSERT INTO tm_segments (source_lang, target_lang, source, target, source_norm, source_mask, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)'''
+UPDATE_TARGET = "UPDATE tm_segments SET target=? WHERE id=?"
+UPDATE_USES = "UPDATE tm_segments SET uses=uses+1 WHERE id=?"
+
+def language_code(tag):
+    # "en-US" -> "en"
+    return tag.replace("_", "-").split("-")[0].lower()
+
+def mask_numbers(text):
+    # Matching key: numbers become "#", case and punctuation are ignored
+    masked = PUNCTUATION.sub(" ", NUMBER.sub("#", normalize_text(text).lower()))
+    return " ".join(masked.split())
+
+def same_apart_from_numbers(a, b):
+    # Token by token, punctuation included; numbers, spacing and case may differ
+    def tokens(text):
+        return TOKEN.findall(NUMBER.sub("#", normalize_text(text).lower()))
+    return tokens(a) == tokens(b)
+
+def fill_template(source, matched_source, matched_target):
+    # Same text apart from numbers: carry the new numbers into the stored translation
+    old, new = NUMBER.findall(matched_source), NUMBER.findall(source)
+    mapping = {}
+    for a, b in zip(old, new):
+        if mapping.setdefault(a, b) != b:
+            return None
+    if sorted(NUMBER.findall(matched_target)) != sorted(old):
+        return None
+    return NUMBER.sub(lambda m: mapping[m.group(0)], matched_target)
+
+class TranslationMemory:
+    def __init__(self, path, pool_size=4):
+        self.pool = ConnectionPool(path, size=pool_size)
+        with self.pool.connection() as conn:
+            conn.execute(CREATE_SEGMENTS)
+            conn.execute(CREATE_MASK_INDEX)
+        self.counts = {"exact": 0, "template": 0, "miss": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, kind):
+        with self._lock:
+            self.counts[kind] += 1
+
+    def lookup(self, source, source_lang, target_lang):
+        # (translation, kind) or None
+        norm = normalize_text(source)
+        masked = mask_numbers(source)
+        with self.pool.connection() as conn:
+            row = conn.execute(SELECT_EXACT, (source_lang, target_lang, norm)).fetchone()
+            if row is not None:
+                conn.execute(UPDATE_USES, (row[0],))
+                self._count("exact")
+                return row[1], "exact"
+            for segment_id, matched_source, matched_target in conn.execute(
+                    SELECT_MASK, (source_lang, target_lang, masked)).fetchall():
+                if not same_apart_from_numbers(source, matched_source):
+                    continue
+                filled = fill_template(source, matched_source, matched_target)
+                if filled is not None:
+                    conn.execute(UPDATE_USES, (segment_id,))
+                    self._count("template")
+                    return filled, "template"
+        self._count("miss")
+        return None
+
+    def _add(self, conn, source, target, source_lang, target_lang):
+        norm = normalize_text(source)
+        if not norm.strip() or not target:
+            return
+        row = conn.execute(SELECT_ID, (source_lang, target_lang, norm)).fetchone()
+        if row is not None:
+            conn.execute(UPDATE_TARGET, (target, row[0]))
+            return
+        conn.execute(INSERT_SEGMENT, (source_lang, target_lang, source, target, norm, mask_numbers(source), time.time()))
+
+    def add(self, source, target, source_lang, target_lang):
+        with self.pool.connection() as conn:
+            self._add(conn, source, target, source_lang, target_lang)
+
+    def add_many(self, pairs):
+        # pairs: (source, target, source_lang, target_lang); one transaction for the lot
+        count = 0
+        with self.pool.connection() as conn:
+            for source, target, source_lang, target_lang in pairs:
+                self._add(conn, source, target, source_lang, target_lang)
+                count += 1
+        return count
+
+    def __len__(self):
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM tm_segments").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self.counts)
+        lookups = sum(counts.values())
+        matched = lookups - counts["miss"]
+        return {
+            "segments_stored": len(self),
+            "lookups": lookups,
+            **counts,
+            "match_rate": matched / lookups if lookups else 0.0,
+        }
+
+    def iter_pairs(self, source_lang=None, target_lang=None):
+        query = "SELECT source, target, source_lang, target_lang FROM tm_segments"
+        clauses, params = [], []
+        for column, value in (("source_lang", source_lang), ("target_lang", target_lang)):
+            if value:
+                clauses.append(f"{column}=?")
+                params.append(value)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self.pool.connection() as conn:
+            yield from conn.execute(query + " ORDER BY id", params)
+
+# Import and export
+def read_jsonl(lines):
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if line.strip():
+            item = json.loads(line)
+            yield item["source"], item["target"], language_code(item["source_lang"]), language_code(item["target_lang"])
+
+def read_tmx(file):
+    # Each <tu> gives one pair from the source language to every other variant in it
+    srclang = None
+    for event, element in iterparse(file, events=("end",)):
+        if element.tag == "header":
+            srclang = element.get("srclang")
+            srclang = None if not srclang or srclang == "*all*" else language_code(srclang)
+        elif element.tag == "tu":
+            variants = []
+            for tuv in element.iter("tuv"):
+                seg = tuv.find("seg")
+                lang = tuv.get(XML_LANG) or tuv.get("lang")
+                if seg is not None and lang:
+                    variants.append((language_code(lang), "".join(seg.itertext())))
+            source_lang = element.get("srclang")
+            source_lang = language_code(source_lang) if source_lang and source_lang != "*all*" else srclang
+            source = next((text for lang, text in variants if lang == source_lang), None)
+            if source is None and variants:
+                source_lang, source = variants[0]
+            for lang, text in variants:
+                if lang != source_lang:
+                    yield source, text, source_lang, lang
+            element.clear()
+
+def write_jsonl(pairs, out):
+    count = 0
+    for source, target, source_lang, target_lang in pairs:
+        out.write(json.dumps({"source_lang": source_lang, "target_lang": target_lang,
+                              "source": source, "target": target}, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+def write_tmx(pairs, out):
+    out.write('<?xml version="1.0" encoding="UTF-8"?>\n<tmx version="1.4">\n'
+              '<header creationtool="voice-translator" creationtoolversion="1" segtype="sentence" '
+              'o-tmf="sqlite" adminlang="en" srclang="*all*" datatype="plaintext"/>\n<body>\n')
+    count = 0
+    for source, target, source_lang, target_lang in pairs:
+        out.write(f'<tu srclang={quoteattr(source_lang)}>'
+                  f'<tuv xml:lang={quoteattr(source_lang)}><seg>{escape(source)}</seg></tuv>'
+                  f'<tuv xml:lang={quoteattr(target_lang)}><seg>{escape(target)}</seg></tuv></tu>\n')
+        count += 1
+    out.write("</body>\n</tmx>\n")
+    return count
+
+def import_file(memory, file, name):
+    if name.lower().endswith(".tmx"):
+        return memory.add_many(read_tmx(file))
+    if name.lower().endswith((".jsonl", ".json")):
+        return memory.add_many(read_jsonl(file))
+    raise ValueError(f"Unsupported translation memory format: {name} (use .tmx or .jsonl)")
+
+def export_file(memory, out, name, source_lang=None, target_lang=None):
+    writer = write_tmx if name.lower().endswith(".tmx") else write_jsonl
+    return writer(memory.iter_pairs(source_lang, target_lang), out)
+
+# Segment-level translation through the memory
+def translate_segments(text, translate_fn, memory, source_lang, target_lang, max_workers=4,
+                       max_chars=MAX_CHUNK_CHARS):
+    # Matched sentences come from the memory; each run of unmatched ones is sent as one request.
+    # When a run's translation splits into as many sentences, each pair is stored on its own.
+    segments = segment(text)
+    pieces = [None] * len(segments)
+    runs, run, run_chars = [], [], 0
+    matched = {"exact": 0, "template": 0}
+    for i, (sentence, sep) in enumerate(segments):
+        match = memory.lookup(sentence, source_lang, target_lang) if sentence.strip() else None
+        if match is not None or not sentence.strip() or run_chars + len(sentence) > max_chars:
+            if run:
+                runs.append(run)
+            run, run_chars = [], 0
+        if match is not None:
+            pieces[i] = match[0] + sep
+            matched[match[1]] += 1
+        elif not sentence.strip():
+            pieces[i] = sentence + sep
+        else:
+            run.append(i)
+            run_chars += len(sentence) + len(sep)
+    if run:
+        runs.append(run)
+
+    def translate_run(index, run):
+        source = "".join(segments[i][0] + (segments[i][1] if i != run[-1] else "") for i in run)
+        translation = translate_fn(source)
+        if not translation or not translation.strip():
+            raise ChunkTranslationError(index, "empty translation")
+        return source, translation
+
+    if runs:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for run, (source, translation) in zip(runs, executor.map(translate_run, range(len(runs)), runs)):
+                parts = [s for s, _ in segment(translation) if s.strip()]
+                if len(parts) == len(run):
+                    pairs = [(segments[i][0], part, source_lang, target_lang) for i, part in zip(run, parts)]
+                    for i, part in zip(run, parts):
+                        pieces[i] = part + segments[i][1]
+                else:
+                    pairs = [(source, translation, source_lang, target_lang)]
+                    pieces[run[0]] = translation + segments[run[-1]][1]
+                    for i in run[1:]:
+                        pieces[i] = ""
+                memory.add_many(pairs)
+    stats = {"segments": sum(1 for s, _ in segments if s.strip()), **matched,
+             "translated": sum(len(r) for r in runs)}
+    return "".join(pieces), stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import, export or inspect the translation memory")
+    parser.add_argument("--db", default="translation_memory.db")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    load = subparsers.add_parser("import", help="import a .tmx or .jsonl file")
+    load.add_argument("file")
+    dump = subparsers.add_parser("export", help="export to a .tmx or .jsonl file")
+    dump.add_argument("file")
+    dump.add_argument("--source")
+    dump.add_argument("--target")
+    subparsers.add_parser("stats", help="number of stored segments")
+    args = parser.parse_args(argv)
+
+    memory = TranslationMemory(args.db)
+    if args.command == "import":
+        with open(args.file, "rb") as f:
+            print(f"Imported {import_file(memory, f, args.file)} segments")
+    elif args.command == "export":
+        with open(args.file, "w", encoding="utf-8") as f:
+            print(f"Exported {export_file(memory, f, args.file, args.source, args.target)} segments")
+    else:
+        print(f"{len(memory)} segments")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+import os
+import random
+import sys
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Shared HTTP transport for external backends: keep-alive pool, rate limit, retries, circuit breaker
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+def _setting(provider, name, default, cast=float):
+    # GOOGLE_TRANSLATE_RATE overrides TRANSPORT_RATE, and so on
+    value = os.getenv(f"{provider.upper()}_{name}", os.getenv(f"TRANSPORT_{name}"))
+    return cast(value) if value is not None else default
+
+class CircuitOpenError(Exception):
+    pass
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+class CircuitBreaker:
+    # closed -> open after N consecutive failures -> half-open after reset_timeout, where a single
+    # probe call is let through -> closed on its success, open again on its failure
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "open":
+                return False
+            # A probe that never reported back (e.g. a non-retryable error) expires like the breaker
+            now = time.monotonic()
+            if self.probe_started is not None and now - self.probe_started < self.reset_timeout:
+                return False
+            self.probe_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probe_started = None
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+class Provider:
+    def __init__(self, name, rate=5.0, burst=10, retries=3, backoff=0.5, max_backoff=8.0,
+                 failure_threshold=5, reset_timeout=30.0, pool_size=10, timeout=15.0):
+        self.name = name
+        self.limiter = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.session = PooledSession(self, pool_size)
+
+    @classmethod
+    def from_env(cls, name):
+        return cls(
+            name,
+            rate=_setting(name, "RATE", 5.0),
+            burst=_setting(name, "BURST", 10, int),
+            retries=_setting(name, "RETRIES", 3, int),
+            failure_threshold=_setting(name, "BREAKER_THRESHOLD", 5, int),
+            reset_timeout=_setting(name, "BREAKER_RESET", 30.0),
+            pool_size=_setting(name, "POOL_SIZE", 10, int),
+        )
+
+    def _sleep_before_retry(self, attempt, response=None):
+        # Full jitter, but never sooner than the server asked for
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(self.max_backoff, float(retry_after)))
+        time.sleep(delay)
+
+    def call(self, fn, *args, retry_on=RETRY_EXCEPTIONS, **kwargs):
+        # Runs fn under the rate limit and breaker; responses with retryable statuses are retried too
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} is unavailable after repeated failures, retrying shortly")
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except retry_on:
+                if attempt == self.retries:
+                    self.breaker.record_failure()
+                    raise
+                self._sleep_before_retry(attempt)
+                continue
+            status = getattr(result, "status_code", None)
+            if status in RETRY_STATUSES:
+                if attempt == self.retries:
+                    self.breaker.record_failure()
+                    return result
+                self._sleep_before_retry(attempt, result)
+                if hasattr(result, "close"):
+                    result.close()
+                continue
+            self.breaker.record_success()
+            return result
+
+# One keep-alive session per provider, shared by all threads
+class PooledSession(requests.Session):
+    def __init__(self, provider, pool_size):
+        super().__init__()
+        self.provider = provider
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def send(self, request, **kwargs):
+        kwargs.setdefault("timeout", self.provider.timeout)
+        send = super().send
+        return self.provider.call(lambda: send(request, **kwargs))
+
+    def close(self):
+        # Third-party clients use "with requests.Session()"; the shared pool outlives them
+        pass
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+def get_provider(name):
+    with _providers_lock:
+        if name not in _providers:
+            _providers[name] = Provider.from_env(name)
+        return _providers[name]
+
+def provider_stats():
+    with _providers_lock:
+        return [{
+            "provider": name,
+            "circuit": provider.breaker.state,
+            "consecutive_failures": provider.breaker.failures,
+            "tokens_available": round(provider.limiter.tokens, 2),
+        } for name, provider in sorted(_providers.items())]
+
+# Stand-in for the requests module inside third-party clients
+class RequestsShim:
+    def __init__(self, provider):
+        self._provider = provider
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+    def Session(self):
+        return self._provider.session
+
+    def request(self, method, url, **kwargs):
+        return self._provider.session.request(method, url, **kwargs)
+
+    def get(self, url, params=None, **kwargs):
+        return self._provider.session.get(url, params=params, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        return self._provider.session.post(url, data=data, json=json, **kwargs)
+
+def route_module(module_name, provider_name):
+    # Makes a client module that did "import requests" use the provider's pooled session
+    module = sys.modules.get(module_name)
+    if module is None or isinstance(getattr(module, "requests", None), RequestsShim):
+        return
+    module.requests = RequestsShim(get_provider(provider_name))
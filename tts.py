@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cache import make_key, normalize_text
+from documents import split_sentences
+from singleflight import SingleFlight
+
+# Chunks a stream keeps queued ahead of playback; the worker pool is shared by every session,
+# so one long text must not hold it for its whole length
+PREFETCH_CHUNKS = 2
+
+def split_for_speech(text, first_chars=150, max_chars=400):
+    # A short first chunk so playback starts quickly, longer ones after it to keep requests few
+    chunks = []
+    current = ""
+    limit = first_chars
+    for sentence in split_sentences(text.strip()):
+        if current and len(current) + len(sentence) + 1 > limit:
+            chunks.append(current)
+            current = ""
+            limit = max_chars
+        current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+# Cached speech synthesis with optional background pre-synthesis
+class SpeechSynthesizer:
+    def __init__(self, cache, synthesize_fn, engine='gtts', max_workers=2):
+        self.cache = cache
+        self.synthesize_fn = synthesize_fn
+        self.engine = engine
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts")
+        # Identical requests from concurrent sessions share one backend call
+        self.flight = SingleFlight("synthesize")
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def key(self, text, language_code):
+        return make_key(normalize_text(text), language_code, self.engine)
+
+    def _synthesize(self, key, text, language_code):
+        # Checked again inside the flight: an earlier one may have just filled the cache
+        audio = self.cache.peek(key)
+        if audio is None:
+            audio = self.synthesize_fn(text, language_code)
+            if audio:
+                self.cache.set(key, audio)
+        return audio
+
+    def _presynthesize(self, key, text, language_code):
+        try:
+            return self.flight.do(key, self._synthesize, key, text, language_code)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def presynthesize(self, text, language_code):
+        # Start synthesis in the background so playback is ready when asked for
+        key = self.key(text, language_code)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self.executor.submit(self._presynthesize, key, text, language_code)
+                self._pending[key] = future
+        return future
+
+    def synthesize(self, text, language_code):
+        key = self.key(text, language_code)
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None:
+            return future.result()
+        audio = self.cache.get(key)
+        if audio is not None:
+            return audio
+        return self.flight.do(key, self._synthesize, key, text, language_code)
+
+    def presynthesize_chunks(self, text, language_code, limit=PREFETCH_CHUNKS):
+        # Only the first chunks: stream() queues the rest as playback gets to them
+        return [self.presynthesize(chunk, language_code) for chunk in split_for_speech(text)[:limit]]
+
+    def stream(self, text, language_code, prefetch=PREFETCH_CHUNKS):
+        # Chunks are yielded in order with at most `prefetch` queued ahead. Queued chunks left
+        # behind when playback stops early still finish and land in the cache.
+        chunks = split_for_speech(text)
+        futures = [self.presynthesize(chunk, language_code) for chunk in chunks[:prefetch]]
+        for i in range(len(chunks)):
+            if i + prefetch < len(chunks):
+                futures.append(self.presynthesize(chunks[i + prefetch], language_code))
+            yield futures[i].result()